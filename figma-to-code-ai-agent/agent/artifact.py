@@ -0,0 +1,62 @@
+# agent/artifact.py
+from __future__ import annotations
+import gzip, json
+from typing import Any, Dict
+
+from .schema import UISchema, compact_node
+
+try:  # optional: ~10x faster encode/decode than the stdlib
+    import orjson
+except ImportError:
+    orjson = None
+
+ARTIFACT_FORMAT = "figma-to-code/ui-schema"
+ARTIFACT_VERSION = 1
+SCHEMA_ARTIFACT = "ui-schema.json.gz"
+
+def _dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def encode_schema(ui: UISchema, compresslevel: int = 6) -> bytes:
+    """Versioned, compact encoding of a UISchema (default-valued node keys dropped).
+
+    compresslevel 0 writes plain minified JSON.
+    """
+    d = ui.model_dump()
+    payload = _dumps({
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "schema": {**d, "root_frames": [compact_node(f) for f in d["root_frames"]]},
+    })
+    if compresslevel:
+        # mtime=0 keeps the bytes stable across runs
+        payload = gzip.compress(payload, compresslevel=compresslevel, mtime=0)
+    return payload
+
+def decode_schema(data: bytes) -> UISchema:
+    """Read an artifact (gzipped or not) or a legacy pretty-printed ui-schema.json."""
+    if data[:2] == b"\x1f\x8b":
+        data = gzip.decompress(data)
+    doc: Dict[str, Any] = _loads(data)
+    if doc.get("format") == ARTIFACT_FORMAT:
+        if doc.get("version", 0) > ARTIFACT_VERSION:
+            raise RuntimeError(f"Schema artifact version {doc['version']} is newer than supported ({ARTIFACT_VERSION})")
+        doc = doc["schema"]
+    return UISchema.model_validate(doc)
+
+def save_schema(ui: UISchema, path: str, compresslevel: int = 6) -> int:
+    data = encode_schema(ui, compresslevel)
+    with open(path, "wb") as f:
+        f.write(data)
+    return len(data)
+
+def load_schema(path: str) -> UISchema:
+    with open(path, "rb") as f:
+        return decode_schema(f.read())
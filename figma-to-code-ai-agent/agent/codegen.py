@@ -1,10 +1,10 @@
 from __future__ import annotations
 import json
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from langchain_google_genai import ChatGoogleGenerativeAI
-from .prompt import SYSTEM_PROMPT, USER_INSTRUCTION
+from .prompt import SYSTEM_PROMPT, USER_INSTRUCTION, REPAIR_INSTRUCTION, INCREMENTAL_INSTRUCTION
 
 class CodeGen:
     def __init__(self, model_name: str, api_key: str):
@@ -15,10 +15,10 @@ class CodeGen:
             convert_system_message_to_human=True,
         )
 
-    def _build_chain(self):
+    def _build_chain(self, instruction: str = USER_INSTRUCTION):
         prompt = ChatPromptTemplate.from_messages([
             ("system", SYSTEM_PROMPT),
-            ("human", USER_INSTRUCTION),
+            ("human", instruction),
         ])
         return prompt | self.llm | StrOutputParser()
 
@@ -27,6 +27,36 @@ class CodeGen:
         out = chain.invoke({"schema_json": json.dumps(schema, indent=2)})
         return out
 
+    def repair(self, failing: Dict[str, Tuple[Optional[str], List[str]]], known_paths: List[str],
+               schema: Optional[dict] = None) -> str:
+        """Ask for corrected versions of only the failing files.
+
+        `failing` maps path -> (current content or None if missing, error messages).
+        """
+        blocks = []
+        for path, (content, errors) in failing.items():
+            errs = "\n".join(f"- {e}" for e in errors)
+            body = f"Current content:\n```\n{content}\n```" if content is not None else "This file is missing."
+            blocks.append(f"### {path}\n{errs}\n{body}")
+        schema_context = f"\nSchema:\n{json.dumps(schema, indent=2)}" if schema is not None else ""
+        chain = self._build_chain(REPAIR_INSTRUCTION)
+        return chain.invoke({
+            "file_list": "\n".join(f"- {p}" for p in known_paths),
+            "failing_files": "\n\n".join(blocks),
+            "schema_context": schema_context,
+        })
+
+    def update(self, changes: str, current: Dict[str, str], known_paths: List[str], schema: dict) -> str:
+        """Ask for the files affected by a design change; `schema` holds only the changed frames."""
+        blocks = [f"### {path}\n```\n{content}\n```" for path, content in current.items()]
+        chain = self._build_chain(INCREMENTAL_INSTRUCTION)
+        return chain.invoke({
+            "file_list": "\n".join(f"- {p}" for p in known_paths),
+            "changes": changes,
+            "current_files": "\n\n".join(blocks) or "(none)",
+            "schema_json": json.dumps(schema, indent=2),
+        })
+
     @staticmethod
     def parse_fenced_files(llm_text: str) -> List[Tuple[str,str]]:
         files: List[Tuple[str,str]] = []
@@ -52,3 +82,25 @@ class CodeGen:
             if in_block:
                 current_buf.append(ln)
         return files
+
+    @staticmethod
+    def unterminated_files(llm_text: str) -> List[Tuple[str,str]]:
+        """Fenced blocks that were opened but never closed (truncated output)."""
+        out: List[Tuple[str,str]] = []
+        current_name = None
+        current_buf: List[str] = []
+        for ln in llm_text.splitlines():
+            if ln.startswith("```file:"):
+                if current_name:
+                    out.append((current_name, "\n".join(current_buf)))
+                current_name = ln[len("```file:"):].strip()
+                current_buf = []
+                continue
+            if current_name and ln.strip() == "```":
+                current_name = None
+                continue
+            if current_name:
+                current_buf.append(ln)
+        if current_name:
+            out.append((current_name, "\n".join(current_buf)))
+        return out
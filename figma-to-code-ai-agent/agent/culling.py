@@ -0,0 +1,131 @@
+# agent/culling.py
+from __future__ import annotations
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+Rect = Tuple[float, float, float, float]  # x0, y0, x1, y1
+
+# node types that carry their own clip rect when clipsContent is set
+CLIPPING_TYPES = ("FRAME", "COMPONENT", "COMPONENT_SET", "INSTANCE", "SECTION")
+
+RULE_NAMES = ("hidden", "zero_area", "transparent", "clipped")
+
+@dataclass
+class CullRules:
+    hidden: bool = True        # visible: false
+    zero_area: bool = True     # width or height <= min_size (unless stroked)
+    transparent: bool = True   # opacity 0, or leaf nodes that paint nothing
+    clipped: bool = True       # entirely outside a clipping ancestor
+    min_size: float = 0.0
+
+    @classmethod
+    def from_names(cls, names: str, min_size: float = 0.0) -> "CullRules":
+        """Rules from a comma-separated list such as "hidden,clipped"; unlisted rules are off."""
+        chosen = {n.strip().replace("-", "_") for n in names.split(",") if n.strip()}
+        unknown = chosen - set(RULE_NAMES)
+        if unknown:
+            raise RuntimeError(f"Unknown cull rule(s): {', '.join(sorted(unknown))} (choose from {', '.join(RULE_NAMES)})")
+        return cls(min_size=min_size, **{n: n in chosen for n in RULE_NAMES})
+
+@dataclass
+class CullStats:
+    nodes_seen: int = 0
+    nodes_removed: int = 0
+    bytes_removed: int = 0
+    hidden: int = 0
+    zero_area: int = 0
+    transparent: int = 0
+    clipped: int = 0
+
+    def summary(self) -> str:
+        return (f"culled {self.nodes_removed}/{self.nodes_seen} nodes, {self.bytes_removed} bytes "
+                f"(hidden={self.hidden}, zero_area={self.zero_area}, "
+                f"transparent={self.transparent}, clipped={self.clipped})")
+
+def _rect(node: Dict[str, Any]) -> Optional[Rect]:
+    b = node.get("absoluteBoundingBox")
+    if not b:
+        return None
+    x, y = b.get("x", 0) or 0, b.get("y", 0) or 0
+    return (x, y, x + (b.get("width", 0) or 0), y + (b.get("height", 0) or 0))
+
+def _intersect(a: Rect, b: Rect) -> Optional[Rect]:
+    x0, y0 = max(a[0], b[0]), max(a[1], b[1])
+    x1, y1 = min(a[2], b[2]), min(a[3], b[3])
+    if x1 < x0 or y1 < y0:
+        return None
+    return (x0, y0, x1, y1)
+
+def _paint_visible(p: Dict[str, Any]) -> bool:
+    if not p.get("visible", True):
+        return False
+    if (p.get("opacity", 1) or 0) <= 0:
+        return False
+    if p.get("type") == "SOLID" and ((p.get("color") or {}).get("a", 1) or 0) <= 0:
+        return False
+    return True
+
+def _has_visible(paints: Any) -> bool:
+    return isinstance(paints, list) and any(_paint_visible(p) for p in paints)
+
+def _count(node: Dict[str, Any]) -> int:
+    return 1 + sum(_count(c) for c in (node.get("children") or []))
+
+def _reason(node: Dict[str, Any], rules: CullRules, clip: Optional[Rect]) -> Optional[str]:
+    if rules.hidden and node.get("visible", True) is False:
+        return "hidden"
+    rect = _rect(node)
+    if rules.transparent:
+        if node.get("opacity") is not None and node["opacity"] <= 0:
+            return "transparent"
+        if (not node.get("children") and node.get("type") not in ("TEXT", "CANVAS", "DOCUMENT")
+                and rect is not None
+                and not _has_visible(node.get("fills")) and not _has_visible(node.get("strokes"))
+                and not _has_visible(node.get("effects"))):
+            return "transparent"
+    if rect is None:
+        return None
+    if rules.zero_area:
+        w, h = rect[2] - rect[0], rect[3] - rect[1]
+        # lines are zero-height boxes with a stroke; frames without clipping may overflow
+        stroked = _has_visible(node.get("strokes")) and (node.get("strokeWeight") or 0) > 0
+        overflow = bool(node.get("children")) and not node.get("clipsContent")
+        if (w <= rules.min_size or h <= rules.min_size) and not stroked and not overflow:
+            return "zero_area"
+    if rules.clipped and clip is not None and _intersect(rect, clip) is None:
+        return "clipped"
+    return None
+
+def _cull(node: Dict[str, Any], rules: CullRules, stats: CullStats, clip: Optional[Rect]) -> Dict[str, Any]:
+    children = node.get("children")
+    if not children:
+        return node
+    child_clip = clip
+    if node.get("type") in CLIPPING_TYPES and node.get("clipsContent"):
+        rect = _rect(node)
+        if rect is not None:
+            child_clip = rect if clip is None else (_intersect(rect, clip) or (rect[0], rect[1], rect[0], rect[1]))
+    kept = []
+    for c in children:
+        stats.nodes_seen += 1
+        reason = _reason(c, rules, clip=child_clip)
+        if reason:
+            stats.nodes_removed += _count(c)
+            stats.nodes_seen += _count(c) - 1
+            stats.bytes_removed += len(json.dumps(c, separators=(",", ":")))
+            setattr(stats, reason, getattr(stats, reason) + 1)
+            continue
+        kept.append(_cull(c, rules, stats, child_clip))
+    out = dict(node)
+    out["children"] = kept
+    return out
+
+def cull_tree(node: Dict[str, Any], rules: Optional[CullRules] = None) -> Tuple[Dict[str, Any], CullStats]:
+    """Return a pruned copy of a raw Figma node tree and what was removed.
+
+    The input is not modified; untouched subtrees are shared with the result.
+    """
+    rules = rules or CullRules()
+    stats = CullStats(nodes_seen=1)
+    return _cull(node, rules, stats, None), stats
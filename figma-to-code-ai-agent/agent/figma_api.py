@@ -19,7 +19,10 @@ class FigmaAPI:
             raise RuntimeError(f"Figma API error {r.status_code} at {url}:\n{r.text}")
         return r.json()
 
-    def get_file(self, file_id: str) -> Dict[str, Any]:
+    def get_file(self, file_id: str, geometry: bool = False) -> Dict[str, Any]:
+        # geometry=paths adds fillGeometry/strokeGeometry to vector nodes
+        if geometry:
+            return self._get(f"{FIGMA_BASE}/files/{file_id}", geometry="paths")
         return self._get(f"{FIGMA_BASE}/files/{file_id}")
 
     def get_images(self, file_id: str, node_ids: List[str], scale: int = 2) -> Dict[str, Any]:
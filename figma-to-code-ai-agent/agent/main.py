@@ -1,6 +1,6 @@
 # agent/main.py
 from __future__ import annotations
-import json, os, math
+import asyncio, json, os, math
 from typing import Optional, Dict, Any, List, Tuple
 import typer
 
@@ -8,7 +8,12 @@ from .config import Settings
 from .figma_api import FigmaAPI
 from .schema import UISchema, Node, Bounds, Color, TextStyle
 from .codegen import CodeGen
-from .writers.react_writer import init_scaffold, write_llm_files
+from .culling import RULE_NAMES, CullRules, cull_tree
+from .svg import VECTOR_TYPES, geometry_from_node, geometry_transform, strip_geometry
+from .artifact import SCHEMA_ARTIFACT, load_schema, save_schema
+from .schema_diff import FrameDiff, diff_frames, load_state, save_state
+from .validation import DEFAULT_CHECKERS, check_tsc, repair_files
+from .writers.react_writer import init_scaffold, target_path, write_llm_files
 from .writers.web_exporter import write_web_export
 from .utils.logging import log
 
@@ -125,6 +130,14 @@ def _walk(node: Dict[str, Any], image_map: Dict[str, str]) -> Node:
             text_align=st.get("textAlignHorizontal"),
         )
 
+    fill_geometry, stroke_geometry, transform = [], [], None
+    if ntype in VECTOR_TYPES:
+        # present only when the file was fetched with geometry=paths
+        fill_geometry = geometry_from_node(node, "fillGeometry")
+        stroke_geometry = geometry_from_node(node, "strokeGeometry")
+        if fill_geometry or stroke_geometry:
+            transform = geometry_transform(node)
+
     children = [_walk(c, image_map) for c in (node.get("children") or [])]
 
     return Node(
@@ -136,6 +149,9 @@ def _walk(node: Dict[str, Any], image_map: Dict[str, str]) -> Node:
         gradient=gradient,
         effects=_effects_from_node(node),
         image_url=image_url,
+        fill_geometry=fill_geometry,
+        stroke_geometry=stroke_geometry,
+        geometry_transform=transform,
         stroke=stroke,
         stroke_width=stroke_w,
         opacity=node.get("opacity"),
@@ -174,6 +190,129 @@ def _figma_to_schema(figma_json: Dict[str, Any], image_map: Dict[str, str]) -> U
 
     return UISchema(file_name=file_name, root_frames=frames, tokens={"spacing":{"md":16,"lg":24}})
 
+def _load_culled(figma_json: Dict[str, Any], cull: Optional[CullRules]) -> Dict[str, Any]:
+    """Prune the raw document with `cull` (None: keep every node)."""
+    if not cull:
+        return figma_json
+    doc, stats = cull_tree(figma_json.get("document", {}), cull)
+    log(f"[cyan]Culling: {stats.summary()}[/cyan]")
+    return {**figma_json, "document": doc}
+
+def _figma_client(file_id: Optional[str]) -> Tuple[FigmaAPI, str]:
+    settings = Settings.validate()
+    if file_id is None:
+        file_id = settings.figma_file_id or ""
+    if not settings.figma_token or not file_id:
+        raise RuntimeError("FIGMA_TOKEN and a file id are required (pass --file-id or set FIGMA_FILE_ID).")
+    return FigmaAPI(settings.figma_token, timeout=settings.http_timeout), file_id
+
+def _resolve_images(api: FigmaAPI, file_id: str, ids: List[str]) -> Dict[str, str]:
+    if not ids:
+        return {}
+    try:
+        resp = api.get_images(file_id, ids, scale=2)
+        return resp.get("images", {}) or {}
+    except Exception as e:
+        log(f"[yellow]Image fetch failed, continuing without images: {e}[/yellow]")
+        return {}
+
+def _ingest(file_id: Optional[str], sample: bool, cull: Optional[CullRules], vectors: bool = True) -> UISchema:
+    if sample:
+        with open(os.path.join(os.path.dirname(__file__), "..", "samples", "figma_sample.json"), "r", encoding="utf-8") as f:
+            figma_json = _load_culled(json.load(f), cull)
+        image_map = {}
+    else:
+        api, file_id = _figma_client(file_id)
+        figma_json = _load_culled(api.get_file(file_id, geometry=vectors), cull)
+        # resolve image nodes -> URLs
+        ids: List[str] = []
+        _collect_image_node_ids(figma_json.get("document", {}), ids)
+        image_map = _resolve_images(api, file_id, ids)
+
+    return _figma_to_schema(figma_json, image_map)
+
+def _llm_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """The schema as sent to the model: no vector path data (e.g. from a --from-schema artifact)."""
+    return {**schema, "root_frames": [strip_geometry(fr) for fr in schema.get("root_frames") or []]}
+
+def _llm_files(cg: CodeGen, schema: Dict[str, Any], checkers, repair_rounds: int) -> List[Tuple[str, str]]:
+    llm_text = cg.generate(schema)
+    return repair_files(cg, llm_text, checkers, max_rounds=repair_rounds, schema=schema) \
+        or [("src/App.tsx","export default function App(){return <div>LLM output empty</div>}")]
+
+def _describe_changes(diff: FrameDiff, frames: Dict[str, Dict[str, Any]], old: Dict[str, Any],
+                      deleted: List[str], max_nodes: int = 20) -> str:
+    lines = [f'- added frame {fid} "{frames[fid].get("name", "")}"' for fid in diff.added]
+    for fid, ids in diff.modified.items():
+        more = f" and {len(ids) - max_nodes} more" if len(ids) > max_nodes else ""
+        lines.append(f'- modified frame {fid} "{frames[fid].get("name", "")}": changed nodes {", ".join(ids[:max_nodes])}{more}')
+    lines += [f'- removed frame {fid} "{old[fid].get("name", "")}"' for fid in diff.removed]
+    if deleted:
+        lines.append(f"- deleted files (they only rendered removed frames): {', '.join(deleted)}")
+    return "\n".join(lines)
+
+def _llm_update(cg: CodeGen, schema: Dict[str, Any], checkers, repair_rounds: int,
+                out: str, state: Dict[str, Any]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """Regenerate only the files touched by frames changed since the last LLM run.
+
+    Returns (files to write, files to delete); nothing is written or deleted here.
+    """
+    frames = {fr.get("id", ""): fr for fr in schema.get("root_frames") or []}
+    diff = diff_frames(state, list(frames.values()))
+    log(f"[cyan]Schema diff: {diff.summary()}[/cyan]")
+    if not diff.changed:
+        log("[green]No frame changes since the last run; keeping the generated files[/green]")
+        return [], []
+
+    old = state.get("frames") or {}
+    project: Dict[str, str] = {}
+    for rel in state.get("files") or []:
+        path = os.path.join(out, rel)
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                project[rel] = f.read()
+    still_used = {p for fid, fr in old.items() if fid not in diff.removed for p in fr.get("files", [])}
+    deleted = sorted(p for p in {p for fid in diff.removed for p in old[fid].get("files", [])} - still_used
+                     if p in project)
+
+    # files of modified frames; App.tsx and other unmarked files when the frame set changes
+    # or a modified frame has no file of its own
+    owned = {p for fr in old.values() for p in fr.get("files", [])}
+    affected = {p for fid in diff.modified for p in old[fid].get("files", [])}
+    if diff.added or diff.removed or any(not old[fid].get("files") for fid in diff.modified):
+        affected.update(p for p in project if p not in owned)
+    partial = {**schema, "root_frames": [fr for fid, fr in frames.items() if fid in diff.added or fid in diff.modified]}
+    remaining = sorted(p for p in project if p not in deleted)
+    llm_text = cg.update(_describe_changes(diff, frames, old, deleted),
+                         {p: project[p] for p in sorted(affected) if p in project}, remaining, partial)
+    files = repair_files(cg, llm_text, checkers, max_rounds=repair_rounds, schema=partial, base=project, removed=deleted)
+    return [(p, c) for p, c in files if project.get(p) != c], deleted
+
+def _write_llm(out: str, files: List[Tuple[str, str]], deleted: List[str],
+               frames: List[Dict[str, Any]], prev_files: List[str]) -> None:
+    write_llm_files(out, files)
+    for rel in deleted:
+        path = os.path.join(out, rel)
+        if os.path.exists(path) and rel not in {target_path(name) for name, _ in files}:
+            os.remove(path)
+            log(f"Removed [cyan]{path}[/cyan]")
+    # hashes of the schema the code on disk now reflects, for the next incremental run
+    save_state(out, frames, list(prev_files) + [target_path(name) for name, _ in files])
+
+def _bundle(out: str, inline_limit: int) -> None:
+    from .writers.bundle import DIST_DIR, bundle_web_export
+    st = bundle_web_export(out, inline_limit)
+    log(f"[cyan]Bundle {os.path.join(out, DIST_DIR)}: {st.before_requests} requests / {st.before_bytes:,} bytes -> "
+        f"{st.after_requests} requests / {st.after_bytes:,} bytes on the wire[/cyan]")
+
+def _done(mode: str, out: str) -> None:
+    if mode == "web":
+        log(f"[green]Done (web export). Open {out}\\index.html in your browser.[/green]")
+    elif mode == "react":
+        log(f"[green]Done (deterministic React). Open {out} and run npm install && npm run dev[/green]")
+    else:
+        log(f"[green]Done. Open {out} and run npm install && npm run dev[/green]")
+
 @app.command(help="Run end-to-end generation.")
 def run(
     file_id: Optional[str] = typer.Option(None, "--file-id", help="Figma file key"),
@@ -182,54 +321,92 @@ def run(
     sample: bool = typer.Option(False, "--sample", help="Use bundled sample schema"),
     deterministic: bool = typer.Option(False, "--deterministic", help="Bypass LLM; render schema directly"),
     format: str = typer.Option("react", "--format", help="Output format: react | web"),
+    cull: bool = typer.Option(True, "--cull/--no-cull", help="Drop hidden, transparent, zero-area and clipped nodes"),
+    cull_rules: str = typer.Option(",".join(RULE_NAMES), "--cull-rules", help=f"Comma-separated culling rules to apply ({', '.join(RULE_NAMES)})"),
+    cull_min_size: float = typer.Option(0.0, "--cull-min-size", help="zero_area rule: also drop unstroked nodes this many px wide/high or less"),
+    repair_rounds: int = typer.Option(2, "--repair-rounds", help="Max follow-up requests for LLM files that fail validation (0 = off)"),
+    tsc: bool = typer.Option(False, "--tsc", help="Also syntax-check LLM output with a local tsc, if installed"),
+    workers: int = typer.Option(1, "--workers", help="Processes for deterministic frame rendering (0 = all cores)"),
+    from_schema: Optional[str] = typer.Option(None, "--from-schema", help="Skip Figma ingestion; load a saved schema artifact"),
+    keep_schema: bool = typer.Option(True, "--save-schema/--no-save-schema", help=f"Write the normalized schema to <out>/{SCHEMA_ARTIFACT}"),
+    pipeline: bool = typer.Option(False, "--pipeline", help="Overlap fetching, image downloads, schema building and writing (asyncio)"),
+    concurrency: int = typer.Option(8, "--concurrency", help="Parallel asset downloads in --pipeline mode"),
+    vectors: bool = typer.Option(True, "--vectors/--no-vectors", help="Fetch vector geometry and emit inline SVG for vector nodes"),
+    columnar: bool = typer.Option(False, "--columnar", help="Web export: compute styles in NumPy batches (needs numpy)"),
+    bundle: bool = typer.Option(False, "--bundle", help="Web export: also write a minified, precompressed single-file bundle to <out>/dist"),
+    inline_limit: int = typer.Option(4096, "--inline-limit", help="With --bundle: inline assets up to this many bytes as data URIs"),
+    incremental: bool = typer.Option(True, "--incremental/--full", help="LLM mode: regenerate only frames changed since the last run"),
 ):
+    fmt = format.lower()
+    mode = fmt if deterministic and fmt in ("web", "react") else "llm"
+    rules = CullRules.from_names(cull_rules, cull_min_size) if cull else None
+    # path data only feeds the deterministic SVG writers; in a prompt it is pure cost
+    vectors = vectors and mode != "llm"
+    state = load_state(out) if mode == "llm" and incremental else None
+    if state is not None:
+        log(f"[cyan]Incremental LLM run against {len(state.get('frames') or {})} frame(s) from the last run[/cyan]")
     os.makedirs(out, exist_ok=True)
-    init_scaffold(out)
+    init_scaffold(out, keep=(state or {}).get("files") or ())
+    checkers = DEFAULT_CHECKERS + ([check_tsc] if tsc else [])
+    if bundle and mode != "web":
+        log("[yellow]--bundle only applies to --deterministic --format web; ignoring it[/yellow]")
+        bundle = False
+    if columnar and mode != "web":
+        log("[yellow]--columnar only applies to --deterministic --format web; ignoring it[/yellow]")
+        columnar = False
 
-    if sample:
-        with open(os.path.join(os.path.dirname(__file__), "..", "samples", "figma_sample.json"), "r", encoding="utf-8") as f:
-            figma_json = json.load(f)
-        image_map = {}
-    else:
+    generate = None
+    if mode == "llm":
         settings = Settings.validate()
-        if file_id is None:
-            file_id = settings.figma_file_id or ""
-        if not settings.figma_token or not file_id:
-            raise RuntimeError("FIGMA_TOKEN and a file id are required (pass --file-id or set FIGMA_FILE_ID).")
-        api = FigmaAPI(settings.figma_token, timeout=settings.http_timeout)
-        figma_json = api.get_file(file_id)
-        # resolve image nodes -> URLs
-        ids: List[str] = []
-        _collect_image_node_ids(figma_json.get("document", {}), ids)
-        image_map = {}
-        if ids:
-            try:
-                resp = api.get_images(file_id, ids, scale=2)
-                image_map = resp.get("images", {}) or {}
-            except Exception as e:
-                log(f"[yellow]Image fetch failed, continuing without images: {e}[/yellow]")
+        cg = CodeGen(settings.model_name, settings.gemini_api_key)
+        used: Dict[str, Any] = {}
 
-    schema = _figma_to_schema(figma_json, image_map).model_dump()
+        def generate(schema: Dict[str, Any]) -> List[Tuple[str, str]]:
+            schema = _llm_schema(schema)
+            used["schema"] = schema
+            if state is None:
+                return _llm_files(cg, schema, checkers, repair_rounds)
+            files, used["deleted"] = _llm_update(cg, schema, checkers, repair_rounds, out, state)
+            return files
 
-    if deterministic and format.lower() == "web":
-        write_web_export(out, schema)
-        log(f"[green]Done (web export). Open {out}\\index.html in your browser.[/green]")
-        return
+        def write_generated(files: List[Tuple[str, str]]) -> None:
+            _write_llm(out, files, used.get("deleted", []), used["schema"].get("root_frames") or [],
+                       (state or {}).get("files") or [])
 
-    # (Other modes unchanged)
-    from .writers.react_renderer import write_schema_render  # optional path if you added it
-    if deterministic and format.lower() == "react":
-        write_schema_render(out, schema)
-        log(f"[green]Done (deterministic React). Open {out} and run npm install && npm run dev[/green]")
+    if pipeline:
+        from .pipeline import run_pipeline
+        files = asyncio.run(run_pipeline(
+            out, file_id=file_id, sample=sample, cull=rules, from_schema=from_schema, keep_schema=keep_schema,
+            mode=mode, vectors=vectors, workers=workers, concurrency=concurrency, columnar=columnar,
+            generate=generate))
+        if files is not None:
+            write_generated(files)
+        if bundle:
+            _bundle(out, inline_limit)
+        _done(mode, out)
         return
 
-    # LLM mode
-    settings = Settings.validate()
-    cg = CodeGen(settings.model_name, settings.gemini_api_key)
-    llm_text = cg.generate(schema)
-    files = cg.parse_fenced_files(llm_text) or [("src/App.tsx","export default function App(){return <div>LLM output empty</div>}")]
-    write_llm_files(out, files)
-    log(f"[green]Done. Open {out} and run npm install && npm run dev[/green]")
+    if from_schema:
+        ui = load_schema(from_schema)
+        log(f"[cyan]Loaded schema from {from_schema} ({len(ui.root_frames)} frames)[/cyan]")
+    else:
+        ui = _ingest(file_id, sample, rules, vectors)
+        if keep_schema:
+            path = os.path.join(out, SCHEMA_ARTIFACT)
+            log(f"[cyan]Saved schema artifact {path} ({save_schema(ui, path)} bytes)[/cyan]")
+
+    schema = ui.model_dump()
+
+    if mode == "web":
+        write_web_export(out, schema, workers=workers, columnar=columnar)
+    elif mode == "react":
+        from .writers.react_renderer import write_schema_render
+        write_schema_render(out, schema, workers=workers)
+    else:
+        write_generated(generate(schema))
+    if bundle:
+        _bundle(out, inline_limit)
+    _done(mode, out)
 
 if __name__ == "__main__":
     app()
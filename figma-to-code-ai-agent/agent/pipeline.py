@@ -0,0 +1,196 @@
+# agent/pipeline.py
+"""Overlapped (asyncio) variant of `run`.
+
+The serial path waits for each stage in turn. Here the image URL request runs
+while the schema is being built, asset downloads start as soon as URLs are
+known, web frames render as soon as their own assets are on disk, and the LLM
+call starts as soon as the schema exists. Blocking work (requests, CPU-bound
+building/rendering, the LLM client) runs in threads; a bounded queue feeds the
+download workers so a huge image list cannot flood the network or memory.
+"""
+from __future__ import annotations
+import asyncio, os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .artifact import SCHEMA_ARTIFACT, load_schema, save_schema
+from .culling import CullRules
+from .main import _collect_image_node_ids, _figma_client, _figma_to_schema, _ingest, _load_culled, _resolve_images
+from .schema import Node, UISchema
+from .svg import VectorOptimizer, sprite_svg
+from .utils.logging import log
+from .writers.parallel import pool_context, resolve_workers
+from .writers.react_renderer import write_schema_render
+from .writers.web_exporter import (ASSET_DIR, _asset_filename, _download_image, _remote_image_nodes,
+                                   _render_frame, _render_frame_columnar, _write_page)
+
+LLMGenerate = Callable[[Dict[str, Any]], List[Tuple[str, str]]]
+
+class AssetDownloads:
+    """Bounded-concurrency image downloads keyed by node id."""
+
+    def __init__(self, dest_dir: str, concurrency: int = 8):
+        self.dest_dir = dest_dir
+        self.concurrency = max(1, concurrency)
+        self._results: Dict[str, asyncio.Future] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self, jobs: List[Tuple[str, str]]) -> None:
+        """Register (node_id, url) jobs and begin downloading in the background."""
+        if self._tasks:
+            return
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        # nested frames are also root frames, so one node can be listed more than once
+        jobs = list(dict(jobs).items())
+        for node_id, _ in jobs:
+            self._results[node_id] = loop.create_future()
+
+        async def produce():
+            for job in jobs:
+                await queue.put(job)  # waits while the workers are saturated
+            for _ in range(self.concurrency):
+                await queue.put(None)
+
+        async def work():
+            while (job := await queue.get()) is not None:
+                node_id, url = job
+                local = await asyncio.to_thread(_download_image, url, self.dest_dir, f"node-{node_id}")
+                self._results[node_id].set_result(local)
+
+        self._tasks = [asyncio.create_task(produce())] + [asyncio.create_task(work()) for _ in range(self.concurrency)]
+
+    async def get(self, node_id: str) -> Optional[str]:
+        """Local path once downloaded; None if it failed or was never scheduled."""
+        fut = self._results.get(node_id)
+        return await fut if fut is not None else None
+
+    async def wait(self) -> Dict[str, Optional[str]]:
+        await asyncio.gather(*self._tasks)
+        return {k: f.result() for k, f in self._results.items()}
+
+def _iter_nodes(nodes: List[Node]) -> Iterator[Node]:
+    for n in nodes:
+        yield n
+        yield from _iter_nodes(n.children)
+
+def _image_fill_ids(node: Dict[str, Any], out: List[str]) -> None:
+    # mirrors _walk: only a first-position IMAGE fill becomes Node.image_url
+    fills = node.get("fills") or []
+    if fills and isinstance(fills, list) and fills[0].get("type") == "IMAGE" and node.get("id"):
+        out.append(node["id"])
+    for c in (node.get("children") or []):
+        _image_fill_ids(c, out)
+
+def _schema_image_jobs(schema: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [(n.get("id", "img"), n["image_url"]) for fr in (schema.get("root_frames") or []) for n in _remote_image_nodes(fr)]
+
+async def _ingest_overlapped(file_id: Optional[str], cull: Optional[CullRules], vectors: bool,
+                             downloads: Optional[AssetDownloads]) -> UISchema:
+    api, file_id = _figma_client(file_id)
+    figma_json = _load_culled(await asyncio.to_thread(api.get_file, file_id, vectors), cull)
+    doc = figma_json.get("document", {})
+    ids: List[str] = []
+    _collect_image_node_ids(doc, ids)
+
+    # build without images while the image URLs are being resolved
+    build = asyncio.create_task(asyncio.to_thread(_figma_to_schema, figma_json, {}))
+    image_map = await asyncio.to_thread(_resolve_images, api, file_id, ids)
+    wanted: List[str] = []
+    _image_fill_ids(doc, wanted)
+    if downloads is not None:
+        downloads.start([(i, image_map[i]) for i in wanted if (image_map.get(i) or "").startswith("http")])
+
+    ui = await build
+    wanted_set = set(wanted)
+    for n in _iter_nodes(ui.root_frames):
+        if n.id in wanted_set:
+            n.image_url = image_map.get(n.id)
+    return ui
+
+async def _export_web(out: str, schema: Dict[str, Any], downloads: AssetDownloads, workers: int,
+                      columnar: bool = False) -> None:
+    frames: List[Dict[str, Any]] = schema.get("root_frames") or []
+    loop = asyncio.get_running_loop()
+    n = min(resolve_workers(workers), len(frames))
+    # download threads are running by now, so the pool must not fork
+    executor = ProcessPoolExecutor(max_workers=n, mp_context=pool_context()) if n > 1 else None
+    vectors = VectorOptimizer()
+    vectors.scan(frames)
+    render = _render_frame_columnar if columnar else _render_frame
+    try:
+        rendering = []
+        for i, fr in enumerate(frames, start=1):
+            # a frame renders once its own assets are in; later frames keep downloading
+            for node in _remote_image_nodes(fr):
+                local = await downloads.get(node.get("id", "img"))
+                if local:
+                    node["image_url"] = local
+            rendering.append(loop.run_in_executor(executor, render, vectors.apply(fr), i))
+        rendered = await asyncio.gather(*rendering)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    await downloads.wait()
+    await asyncio.to_thread(_write_page, out, schema, list(rendered), sprite_svg(vectors.symbols))
+
+async def _generate_llm(schema: Dict[str, Any], downloads: AssetDownloads, generate: LLMGenerate) -> List[Tuple[str, str]]:
+    # point image nodes at where Vite will serve the mirrored copies, then mirror them during the LLM call
+    remote: Dict[str, str] = {}
+    for fr in (schema.get("root_frames") or []):
+        for node in _remote_image_nodes(fr):
+            local = f"/{ASSET_DIR}/{_asset_filename(node['image_url'], 'node-' + node.get('id', 'img'))}"
+            remote[node.get("id", "img")] = node["image_url"]
+            node["image_url"] = local
+    downloads.start(list(remote.items()))
+    files, results = await asyncio.gather(asyncio.to_thread(generate, schema), downloads.wait())
+
+    failed = {f"/{ASSET_DIR}/{_asset_filename(remote[i], 'node-' + i)}": remote[i] for i, ok in results.items() if not ok}
+    if failed:
+        log(f"[yellow]{len(failed)} asset download(s) failed; keeping remote URLs for them[/yellow]")
+        for k, (name, content) in enumerate(files):
+            for local, url in failed.items():
+                content = content.replace(local, url)
+            files[k] = (name, content)
+    return files
+
+async def run_pipeline(out: str, *, file_id: Optional[str], sample: bool, cull: Optional[CullRules], from_schema: Optional[str],
+                       keep_schema: bool, mode: str, vectors: bool = True, workers: int = 1, concurrency: int = 8,
+                       columnar: bool = False, generate: Optional[LLMGenerate] = None) -> Optional[List[Tuple[str, str]]]:
+    """Run ingestion and the chosen writer with overlapping stages.
+
+    mode is "web", "react" or "llm"; for "llm" the generated files are
+    returned (with `generate` doing the model call) rather than written.
+    """
+    dest = {"web": os.path.join(out, ASSET_DIR), "llm": os.path.join(out, "public", ASSET_DIR)}.get(mode)
+    downloads = AssetDownloads(dest, concurrency) if dest else None
+    if dest:
+        os.makedirs(dest, exist_ok=True)
+
+    vectors = vectors and mode != "llm"
+    if from_schema:
+        ui = await asyncio.to_thread(load_schema, from_schema)
+        log(f"[cyan]Loaded schema from {from_schema} ({len(ui.root_frames)} frames)[/cyan]")
+    elif sample:
+        ui = await asyncio.to_thread(_ingest, file_id, sample, cull, vectors)
+    else:
+        ui = await _ingest_overlapped(file_id, cull, vectors, downloads if mode == "web" else None)
+
+    saving = None
+    if keep_schema and not from_schema:
+        path = os.path.join(out, SCHEMA_ARTIFACT)
+        saving = asyncio.create_task(asyncio.to_thread(save_schema, ui, path))
+    schema = ui.model_dump()
+
+    files = None
+    if mode == "web":
+        downloads.start(_schema_image_jobs(schema))  # no-op if ingestion already started them
+        await _export_web(out, schema, downloads, workers, columnar)
+    elif mode == "react":
+        await asyncio.to_thread(write_schema_render, out, schema, workers)
+    else:
+        files = await _generate_llm(schema, downloads, generate)
+
+    if saving is not None:
+        log(f"[cyan]Saved schema artifact {path} ({await saving} bytes)[/cyan]")
+    return files
@@ -25,8 +25,45 @@ Requirements:
 - Each fenced block must begin exactly with:
   ```file:<relative-path>
 - `App.tsx` must import and render the components.
+- Start every component file with a comment line naming the schema frame id(s) it renders, e.g.
+  `// figma-frame: 1:2` (comma-separate several ids). `App.tsx` and shared helpers have no such line.
 - No external deps beyond React/Tailwind; TSX must compile.
 
 Schema:
 {schema_json}
 """
+
+REPAIR_INSTRUCTION = """
+Some of the files you generated failed validation. Return corrected versions of ONLY the files listed below,
+each as a complete file (no diffs, no ellipses), using the same fenced format:
+  ```file:<relative-path>
+
+Files already in the project (do not resend them):
+{file_list}
+
+Failing files and their errors:
+{failing_files}
+{schema_context}
+"""
+
+INCREMENTAL_INSTRUCTION = """
+The design changed since you generated this project. Update the code for the changed frames only.
+
+Files already in the project:
+{file_list}
+
+Changes since the last generation:
+{changes}
+
+Current content of the files that render the changed frames:
+{current_files}
+
+Return complete, updated versions of ONLY the files that must change (including `src/App.tsx` when frames were
+added or removed), plus any new component files, using the same fenced format:
+  ```file:<relative-path>
+Every component file must keep (or, if new, start with) its `// figma-frame: <frame id>` line.
+Do not resend files that stay the same. No external deps beyond React/Tailwind; TSX must compile.
+
+Schema of the added and modified frames:
+{schema_json}
+"""
@@ -34,6 +34,9 @@ class Node(BaseModel):
     gradient: Optional[Dict[str, Any]] = None        # {"type": "linear|radial", "stops":[(pos,rgba),...], "angle":deg}
     effects: List[Dict[str, Any]] = []               # [{"type":"drop|inner","x":..,"y":..,"blur":..,"color":{...}}]
     image_url: Optional[str] = None                  # resolved via Figma images API
+    fill_geometry: List[Dict[str, Any]] = []         # vector paths: [{"path": "M0 0L..", "rule": "nonzero|evenodd"}]
+    stroke_geometry: List[Dict[str, Any]] = []       # stroke outlines, painted with the stroke color
+    geometry_transform: Optional[List[float]] = None # SVG matrix(a b c d e f) from path space into the bounds box; rotated/flipped vectors only
 
     stroke: Optional[Color] = None
     stroke_width: Optional[float] = None
@@ -51,3 +54,17 @@ class UISchema(BaseModel):
     file_name: str
     root_frames: List[Node]
     tokens: Dict[str, Any] = {}
+
+def compact_node(n: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop keys still at their model default (None / []) -- most of a dumped Node."""
+    return {k: ([compact_node(c) for c in v] if k == "children" else v)
+            for k, v in n.items() if v is not None and v != []}
+
+def inflate_node(n: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of compact_node: restore every Node field in model order."""
+    out: Dict[str, Any] = {}
+    for k, f in Node.model_fields.items():
+        v = n.get(k, f.default)
+        out[k] = list(v) if isinstance(v, list) else v
+    out["children"] = [inflate_node(c) for c in n.get("children") or []]
+    return out
@@ -0,0 +1,118 @@
+# agent/schema_diff.py
+"""Frame-level schema diff for incremental LLM runs.
+
+Every node gets a content hash over its own fields (children excluded) and
+every frame a Merkle-style hash over its subtree, so frames are compared by
+id and hash alone. After an LLM run, `save_state` records in <out>/llm-state.json
+the frame hashes the code was generated from and which generated files render
+which frame (read from a `// figma-frame: <id>` marker line the model is asked
+to put at the top of each component file). The next run diffs the new schema
+against that state instead of regenerating everything.
+"""
+from __future__ import annotations
+import hashlib, json, os, re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+LLM_STATE = "llm-state.json"
+STATE_VERSION = 1
+FRAME_MARKER = "// figma-frame:"
+_MARKER_RE = re.compile(r"^\s*//\s*figma-frame:\s*(.+)$", re.M)
+
+def _hash(obj: Any) -> str:
+    data = json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+    return hashlib.sha1(data).hexdigest()
+
+def _own_fields(n: Dict[str, Any]) -> Dict[str, Any]:
+    out = {k: v for k, v in n.items() if k != "children"}
+    if "image_url" in out:
+        # only whether there is an image: Figma's render URLs change on every fetch, and
+        # --pipeline swaps them for local /assets paths before the model (and this hash) sees them
+        out["image_url"] = bool(out["image_url"])
+    return out
+
+def hash_frame(frame: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
+    """(subtree hash, {node id: own-content hash}) for a dumped frame."""
+    nodes: Dict[str, str] = {}
+
+    def walk(n: Dict[str, Any]) -> str:
+        own = _hash(_own_fields(n))
+        nodes[n.get("id", "")] = own
+        return _hash([own] + [walk(c) for c in (n.get("children") or [])])
+
+    return walk(frame), nodes
+
+@dataclass
+class FrameDiff:
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    modified: Dict[str, List[str]] = field(default_factory=dict)  # frame id -> changed node ids
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+    def summary(self) -> str:
+        return (f"{len(self.added)} added, {len(self.removed)} removed, {len(self.modified)} modified, "
+                f"{len(self.unchanged)} unchanged frame(s)")
+
+def diff_frames(state: Dict[str, Any], frames: List[Dict[str, Any]]) -> FrameDiff:
+    """Classify `frames` against a saved state by frame id and content hash."""
+    old: Dict[str, Dict[str, Any]] = state.get("frames") or {}
+    diff = FrameDiff()
+    seen = set()
+    for fr in frames:
+        fid = fr.get("id", "")
+        seen.add(fid)
+        h, nodes = hash_frame(fr)
+        prev = old.get(fid)
+        if prev is None:
+            diff.added.append(fid)
+        elif prev.get("hash") == h:
+            diff.unchanged.append(fid)
+        else:
+            before = prev.get("nodes") or {}
+            diff.modified[fid] = sorted(
+                [i for i, nh in nodes.items() if before.get(i) != nh] + [i for i in before if i not in nodes])
+    diff.removed = [fid for fid in old if fid not in seen]
+    return diff
+
+def frame_markers(content: str) -> List[str]:
+    """Frame ids a generated file declares it renders."""
+    ids: List[str] = []
+    for m in _MARKER_RE.finditer(content):
+        ids.extend(i.strip() for i in m.group(1).split(",") if i.strip())
+    return ids
+
+def load_state(out_dir: str) -> Optional[Dict[str, Any]]:
+    path = os.path.join(out_dir, LLM_STATE)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("version") == STATE_VERSION else None
+
+def save_state(out_dir: str, frames: List[Dict[str, Any]], paths: Iterable[str]) -> str:
+    """Record frame hashes and the frame -> file mapping for the files now on disk."""
+    files: Dict[str, List[str]] = {}
+    for rel in sorted(set(paths)):
+        full = os.path.join(out_dir, rel)
+        if not os.path.exists(full):
+            continue
+        with open(full, "r", encoding="utf-8") as f:
+            ids = frame_markers(f.read())
+        files[rel] = ids
+    state_frames = {}
+    for fr in frames:
+        h, nodes = hash_frame(fr)
+        fid = fr.get("id", "")
+        state_frames[fid] = {"name": fr.get("name", ""), "hash": h, "nodes": nodes,
+                             "files": [p for p, ids in files.items() if fid in ids]}
+    path = os.path.join(out_dir, LLM_STATE)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"version": STATE_VERSION, "frames": state_frames, "files": sorted(files)}, f, indent=1)
+    return path
@@ -0,0 +1,238 @@
+# agent/svg.py
+"""Vector geometry -> compact SVG.
+
+Figma's fillGeometry/strokeGeometry paths are absolute M/L/C/Q/Z commands in
+node-local coordinates. We quantize coordinates, drop redundant points from
+straight-line runs (Ramer-Douglas-Peucker), and move any path used more than
+once into a shared <symbol> referenced with <use>.
+"""
+from __future__ import annotations
+import math, re
+from typing import Any, Dict, List, Optional, Tuple
+
+VECTOR_TYPES = ("VECTOR", "BOOLEAN_OPERATION", "ELLIPSE", "STAR", "LINE", "REGULAR_POLYGON")
+
+Point = Tuple[float, float]
+
+_TOKEN = re.compile(r"[A-Za-z]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?")
+_ARITY = {"M": 2, "L": 2, "H": 1, "V": 1, "C": 6, "Q": 4, "Z": 0}
+
+def _num(v: float, precision: int) -> str:
+    s = f"{round(v, precision):.{precision}f}".rstrip("0").rstrip(".") if precision > 0 else str(int(round(v)))
+    if s in ("-0", ""):
+        s = "0"
+    if s.startswith("0."):
+        s = s[1:]
+    elif s.startswith("-0."):
+        s = "-" + s[2:]
+    return s
+
+def _perp_dist(p: Point, a: Point, b: Point) -> float:
+    dx, dy = b[0] - a[0], b[1] - a[1]
+    if dx == 0 and dy == 0:
+        return math.hypot(p[0] - a[0], p[1] - a[1])
+    return abs(dy * p[0] - dx * p[1] + b[0] * a[1] - b[1] * a[0]) / math.hypot(dx, dy)
+
+def rdp(points: List[Point], tolerance: float) -> List[Point]:
+    """Ramer-Douglas-Peucker simplification of a polyline (endpoints kept)."""
+    if len(points) < 3 or tolerance <= 0:
+        return points
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        lo, hi = stack.pop()
+        best, idx = 0.0, -1
+        for i in range(lo + 1, hi):
+            d = _perp_dist(points[i], points[lo], points[hi])
+            if d > best:
+                best, idx = d, i
+        if idx >= 0 and best > tolerance:
+            keep[idx] = True
+            stack.append((lo, idx))
+            stack.append((idx, hi))
+    return [p for p, k in zip(points, keep) if k]
+
+def _parse(d: str) -> Optional[List[Tuple[str, List[float]]]]:
+    """Split into (command, args) with absolute coordinates; None if unsupported commands appear."""
+    tokens = _TOKEN.findall(d)
+    out: List[Tuple[str, List[float]]] = []
+    i, cmd = 0, None
+    while i < len(tokens):
+        t = tokens[i]
+        if t.isalpha():
+            if t.upper() not in _ARITY or t != t.upper():
+                return None  # relative or arc commands: leave to the quantizer
+            cmd = t
+            i += 1
+            if cmd == "Z":
+                out.append(("Z", []))
+                continue
+        if cmd is None or cmd == "Z":
+            return None
+        n = _ARITY[cmd]
+        args = tokens[i:i + n]
+        if len(args) < n or any(a.isalpha() for a in args):
+            return None
+        out.append((cmd, [float(a) for a in args]))
+        i += n
+        if cmd == "M":
+            cmd = "L"  # implicit lineto after moveto
+    return out
+
+def optimize_path(d: str, precision: int = 2, tolerance: float = 0.25) -> str:
+    """Quantize and simplify one SVG path string."""
+    cmds = _parse(d)
+    if cmds is None:
+        return _TOKEN.sub(lambda m: m.group(0) if m.group(0).isalpha() else _num(float(m.group(0)), precision), d)
+
+    out: List[str] = []
+    cur: Point = (0.0, 0.0)
+    start: Point = cur
+    run: List[Point] = []  # current point followed by consecutive L targets
+
+    def flush():
+        if len(run) > 1:
+            for x, y in rdp(run, tolerance)[1:]:
+                out.append(f"L{_num(x, precision)} {_num(y, precision)}")
+        run.clear()
+
+    for cmd, a in cmds:
+        if cmd in ("L", "H", "V"):
+            x = a[0] if cmd in ("L", "H") else cur[0]
+            y = a[-1] if cmd in ("L", "V") else cur[1]
+            if not run:
+                run.append(cur)
+            cur = (x, y)
+            run.append(cur)
+            continue
+        flush()
+        if cmd == "M":
+            cur = start = (a[0], a[1])
+            out.append(f"M{_num(a[0], precision)} {_num(a[1], precision)}")
+        elif cmd == "Z":
+            cur = start
+            out.append("Z")
+        else:
+            out.append(cmd + " ".join(_num(v, precision) for v in a))
+            cur = (a[-2], a[-1])
+    flush()
+    return "".join(out)
+
+def geometry_from_node(node: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    """Raw Figma fillGeometry/strokeGeometry -> [{"path": d, "rule": "nonzero|evenodd"}]."""
+    out: List[Dict[str, Any]] = []
+    for g in (node.get(key) or []):
+        if g.get("path"):
+            out.append({"path": g["path"], "rule": "evenodd" if g.get("windingRule") == "EVENODD" else "nonzero"})
+    return out
+
+def geometry_transform(node: Dict[str, Any]) -> Optional[List[float]]:
+    """Map a rotated/flipped vector's local path space into its bounding box.
+
+    Paths are in the node's own (unrotated) space of size `size`, but the
+    node is drawn in its absoluteBoundingBox, which for a rotated node is
+    the box around the rotated shape. Returns SVG matrix(a b c d e f)
+    values, or None when the node is axis-aligned and no transform is needed.
+    """
+    m, size = node.get("relativeTransform"), node.get("size")
+    if not m or not size:
+        return None
+    a, c, b, d = m[0][0], m[0][1], m[1][0], m[1][1]
+    if abs(a - 1) < 1e-6 and abs(d - 1) < 1e-6 and abs(b) < 1e-6 and abs(c) < 1e-6:
+        return None
+    w, h = size.get("x", 0) or 0, size.get("y", 0) or 0
+    xs = [a * x + c * y for x, y in ((0, 0), (w, 0), (0, h), (w, h))]
+    ys = [b * x + d * y for x, y in ((0, 0), (w, 0), (0, h), (w, h))]
+    return [a, b, c, d, -min(xs), -min(ys)]
+
+def strip_geometry(n: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a dumped node tree without path data; subtrees without vectors are shared."""
+    children = n.get("children") or []
+    new_children = [strip_geometry(c) for c in children]
+    if not n.get("fill_geometry") and not n.get("stroke_geometry") \
+            and all(a is b for a, b in zip(new_children, children)):
+        return n
+    return {**n, "children": new_children, "fill_geometry": [], "stroke_geometry": [], "geometry_transform": None}
+
+class VectorOptimizer:
+    """Optimizes vector paths and shares repeated ones as symbols.
+
+    scan() every frame first so ids cover the whole document, then apply()
+    each frame just before rendering it. apply() returns a copy; nodes
+    without vectors below them are shared, not copied.
+    """
+
+    def __init__(self, precision: int = 2, tolerance: float = 0.25):
+        self.precision = precision
+        self.tolerance = tolerance
+        self._paths: Dict[str, str] = {}  # raw -> optimized
+        self._ids: Dict[str, str] = {}    # optimized -> symbol id
+
+    def _opt(self, d: str) -> str:
+        out = self._paths.get(d)
+        if out is None:
+            out = self._paths[d] = optimize_path(d, self.precision, self.tolerance)
+        return out
+
+    def scan(self, frames: List[Dict[str, Any]]) -> None:
+        counts: Dict[str, int] = {}
+        stack = list(frames)
+        while stack:
+            n = stack.pop()
+            for g in (n.get("fill_geometry") or []) + (n.get("stroke_geometry") or []):
+                d = self._opt(g["path"])
+                counts[d] = counts.get(d, 0) + 1
+            stack.extend(reversed(n.get("children") or []))
+        for d, c in counts.items():
+            if c > 1 and d not in self._ids:
+                self._ids[d] = f"v{len(self._ids)}"
+
+    @property
+    def symbols(self) -> Dict[str, str]:
+        return {v: d for d, v in self._ids.items()}
+
+    def apply(self, n: Dict[str, Any]) -> Dict[str, Any]:
+        children = n.get("children") or []
+        new_children = [self.apply(c) for c in children]
+        fg, sg = n.get("fill_geometry") or [], n.get("stroke_geometry") or []
+        if not fg and not sg and all(a is b for a, b in zip(new_children, children)):
+            return n
+        out = dict(n)
+        out["children"] = new_children
+        for key, geo in (("fill_geometry", fg), ("stroke_geometry", sg)):
+            entries = []
+            for g in geo:
+                d = self._opt(g["path"])
+                entries.append({"ref": self._ids[d], "rule": g["rule"]} if d in self._ids else {"path": d, "rule": g["rule"]})
+            out[key] = entries
+        return out
+
+def sprite_svg(symbols: Dict[str, str], jsx: bool = False) -> str:
+    """Hidden <svg> holding the shared symbols (empty string if none)."""
+    if not symbols:
+        return ""
+    style = "{{ position: 'absolute', width: 0, height: 0 }}" if jsx else '"position:absolute;width:0;height:0"'
+    body = "".join(f'<symbol id="{k}" overflow="visible"><path d="{d}"/></symbol>' for k, d in symbols.items())
+    return f'<svg aria-hidden="true" style={style}>{body}</svg>'
+
+def vector_svg(n: Dict[str, Any], fill: Optional[str], stroke: Optional[str], jsx: bool = False) -> str:
+    """Inline <svg> for a node's geometry, sized to its bounds (rotated paths mapped into them)."""
+    b = n.get("bounds") or {}
+    w, h = b.get("width", 0) or 0, b.get("height", 0) or 0
+    rule_attr = "fillRule" if jsx else "fill-rule"
+    parts = []
+    for key, color in (("fill_geometry", fill), ("stroke_geometry", stroke)):
+        paint = color or "none"
+        for g in (n.get(key) or []):
+            rule = f' {rule_attr}="{g["rule"]}"' if g.get("rule") == "evenodd" else ""
+            if g.get("ref"):
+                parts.append(f'<use href="#{g["ref"]}" fill="{paint}"{rule}/>')
+            else:
+                parts.append(f'<path d="{g["path"]}" fill="{paint}"{rule}/>')
+    body = "".join(parts)
+    t = n.get("geometry_transform")
+    if t:
+        body = f'<g transform="matrix({" ".join(_num(v, 4) for v in t)})">{body}</g>'
+    return (f'<svg width="100%" height="100%" viewBox="0 0 {_num(w, 2)} {_num(h, 2)}" preserveAspectRatio="none" '
+            f'overflow="visible">{body}</svg>')
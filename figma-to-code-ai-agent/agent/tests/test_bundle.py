@@ -0,0 +1,40 @@
+import gzip, json, os
+
+from agent.schema import UISchema, Node, Bounds, Color
+from agent.writers.bundle import bundle_web_export, minify_css
+from agent.writers.web_exporter import ASSET_DIR, write_web_export
+
+def _export(out):
+    os.makedirs(os.path.join(out, ASSET_DIR))
+    for name, size in (("small.png", 100), ("big.png", 10_000)):
+        with open(os.path.join(out, ASSET_DIR, name), "wb") as f:
+            f.write(os.urandom(size))
+    schema = UISchema(file_name="x", root_frames=[
+        Node(id="1:0", name="F", type="FRAME", bounds=Bounds(x=0, y=0, width=100, height=50), children=[
+            Node(id="1:1", name="S", type="RECTANGLE", bounds=Bounds(x=0, y=0, width=10, height=10), image_url=f"./{ASSET_DIR}/small.png"),
+            Node(id="1:2", name="B", type="RECTANGLE", bounds=Bounds(x=10, y=0, width=10, height=10), image_url=f"./{ASSET_DIR}/big.png"),
+            Node(id="1:3", name="T", type="TEXT", text="hi", fill=Color(r=1, g=0, b=0)),
+        ])]).model_dump()
+    write_web_export(out, schema)
+
+def test_bundle(tmp_path):
+    out = str(tmp_path)
+    _export(out)
+    st = bundle_web_export(out, inline_limit=1024)
+    dist = os.path.join(out, "dist")
+    with open(os.path.join(dist, "index.html"), encoding="utf-8") as f:
+        html = f.read()
+    with open(os.path.join(dist, "manifest.json")) as f:
+        manifest = json.load(f)
+
+    assert "styles.css" not in html and "<script" not in html and "<style>" in html
+    assert "data:image/png;base64," in html and "small.png" not in html
+    assert list(manifest) == [f"{ASSET_DIR}/big.png"] and f"./{manifest[f'{ASSET_DIR}/big.png']}" in html
+    assert os.path.exists(os.path.join(dist, manifest[f"{ASSET_DIR}/big.png"]))
+    with gzip.open(os.path.join(dist, "index.html.gz"), "rt", encoding="utf-8") as f:
+        assert f.read() == html
+    assert (st.before_requests, st.after_requests) == (5, 2)
+    assert st.after_bytes < st.before_bytes
+
+def test_minify_css():
+    assert minify_css("/* c */ a , b {\n  color : red ;\n}\n") == "a,b{color:red}"
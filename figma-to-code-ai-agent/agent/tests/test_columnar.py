@@ -0,0 +1,37 @@
+import pytest
+
+from agent.schema import UISchema, Node, Bounds, Color, TextStyle
+from agent.writers import columnar, web_exporter
+
+pytestmark = pytest.mark.skipif(not columnar.available(), reason="numpy not installed")
+
+def _frames():
+    red, clear = Color(r=1, g=0, b=0), Color(r=0.2, g=0.4, b=0.6, a=0)
+    return UISchema(file_name="x", root_frames=[
+        Node(id="1:0", name="F", type="FRAME", bounds=Bounds(x=0, y=0, width=320, height=200), children=[
+            Node(id="1:1", name="T", type="TEXT", text="hi", bounds=Bounds(x=8, y=8, width=100, height=20), opacity=0.5,
+                 text_style=TextStyle(font_family="Inter", font_size=14, font_weight=600, text_align="CENTER")),
+            Node(id="1:2", name="R", type="RECTANGLE", bounds=Bounds(x=-0.0, y=12.25, width=40, height=40), fill=clear,
+                 stroke=red, stroke_width=1.5, corner_radius_all=0, children=[
+                Node(id="1:3", name="E", type="ELLIPSE", bounds=Bounds(x=1, y=1, width=10, height=10), fill=red),
+                Node(id="1:4", name="C", type="RECTANGLE", corner_radius_tl=4, corner_radius_br=2,
+                     gradient={"type": "linear", "angle": 90, "stops": [{"position": 0, "color": {"r": 1, "g": 1, "b": 1}}]},
+                     effects=[{"type": "drop", "x": 0, "y": 2, "blur": 4, "color": {"r": 0, "g": 0, "b": 0, "a": 0.25}}]),
+            ]),
+            Node(id="1:5", name="I", type="RECTANGLE", bounds=Bounds(x=50, y=60, width=30, height=30), image_url="./a.png"),
+            Node(id="1:6", name="V", type="VECTOR", bounds=Bounds(x=5, y=5, width=8, height=8), fill=red,
+                 fill_geometry=[{"path": "M0 0L8 8Z", "rule": "nonzero"}]),
+        ]),
+        Node(id="2:0", name="G", type="FRAME", children=[Node(id="2:1", name="R", type="RECTANGLE", fill=red)]),
+    ]).model_dump()["root_frames"]
+
+def test_columnar_matches_dict_path():
+    frames = _frames()
+    render = web_exporter._render_all
+    assert render(frames, 1, columnar=True) == render(frames, 1, columnar=False)
+    assert render(frames, 2, columnar=True) == render(frames, 1, columnar=False)
+
+def test_parent_index():
+    table = columnar.NodeTable.from_frames(_frames())
+    assert [n["id"] for n in table.nodes] == ["1:1", "1:2", "1:3", "1:4", "1:5", "1:6", "2:1"]
+    assert table.parent.tolist() == [-1, -1, 1, 1, -1, -1, -1]
@@ -0,0 +1,44 @@
+import pytest
+
+from agent.culling import CullRules, cull_tree
+
+def _box(id, x, y, w, h, **kw):
+    n = {"id": id, "name": id, "type": kw.pop("type", "RECTANGLE"),
+         "absoluteBoundingBox": {"x": x, "y": y, "width": w, "height": h},
+         "fills": [{"type": "SOLID", "color": {"r": 1, "g": 0, "b": 0, "a": 1}}]}
+    n.update(kw)
+    return n
+
+def _frame(children, clips=True):
+    return _box("f", 0, 0, 100, 100, type="FRAME", clipsContent=clips, children=children)
+
+def test_cull_removes_hidden_zero_transparent_and_clipped():
+    frame = _frame([
+        _box("keep", 10, 10, 20, 20),
+        _box("hidden", 10, 10, 20, 20, visible=False, children=[_box("h1", 0, 0, 1, 1)]),
+        _box("zero", 10, 10, 0, 20),
+        _box("clear", 10, 10, 20, 20, opacity=0),
+        _box("outside", 200, 200, 20, 20),
+    ])
+    out, stats = cull_tree(frame)
+    assert [c["id"] for c in out["children"]] == ["keep"]
+    assert stats.nodes_removed == 5
+    assert (stats.hidden, stats.zero_area, stats.transparent, stats.clipped) == (1, 1, 1, 1)
+    assert stats.bytes_removed > 0
+    assert len(frame["children"]) == 5  # input untouched
+
+def test_cull_respects_rules_and_unclipped_frames():
+    frame = _frame([_box("outside", 200, 200, 20, 20), _box("line", 0, 50, 100, 0,
+                    strokes=[{"type": "SOLID", "color": {"r": 0, "g": 0, "b": 0}}], strokeWeight=1)], clips=False)
+    out, stats = cull_tree(frame)
+    assert len(out["children"]) == 2 and stats.nodes_removed == 0
+    out, _ = cull_tree(_frame([_box("hidden", 0, 0, 5, 5, visible=False)]), CullRules(hidden=False))
+    assert len(out["children"]) == 1
+
+def test_rules_from_names():
+    rules = CullRules.from_names("hidden, clipped", min_size=2)
+    assert (rules.hidden, rules.zero_area, rules.transparent, rules.clipped, rules.min_size) == (True, False, False, True, 2)
+    out, stats = cull_tree(_frame([_box("tiny", 0, 0, 1, 1), _box("dot", 0, 0, 1, 1)]), CullRules.from_names("zero-area", 1))
+    assert out["children"] == [] and stats.zero_area == 2
+    with pytest.raises(RuntimeError, match="Unknown cull rule"):
+        CullRules.from_names("hidden,offscreen")
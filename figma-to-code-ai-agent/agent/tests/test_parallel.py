@@ -0,0 +1,34 @@
+from agent.schema import UISchema, Node, Bounds, Color, compact_node, inflate_node
+from agent.writers.parallel import render_frames
+from agent.writers.react_renderer import _render_frame_component
+from agent.writers.web_exporter import _render_frame
+
+def _frames(n=5):
+    return UISchema(file_name="x", root_frames=[
+        Node(id=f"{i}:0", name="F", type="FRAME", bounds=Bounds(x=0, y=0, width=100, height=50), children=[
+            Node(id=f"{i}:1", name="T", type="TEXT", text=f"hi {i}", fill=Color(r=1, g=0, b=0)),
+            Node(id=f"{i}:2", name="R", type="RECTANGLE", corner_radius_all=4),
+        ]) for i in range(n)]).model_dump()["root_frames"]
+
+def test_compact_roundtrip():
+    for fr in _frames():
+        assert inflate_node(compact_node(fr)) == fr
+
+def test_parallel_matches_serial():
+    frames = _frames()
+    for fn in (_render_frame_component, _render_frame):
+        assert render_frames(fn, frames, workers=2) == render_frames(fn, frames, workers=1)
+
+def test_no_fork_while_threads_run():
+    import threading
+    from agent.writers.parallel import pool_context
+    stop = threading.Event()
+    t = threading.Thread(target=stop.wait)
+    t.start()
+    try:
+        assert pool_context().get_start_method() != "fork"
+        frames = _frames()
+        assert render_frames(_render_frame, frames, workers=2) == render_frames(_render_frame, frames, workers=1)
+    finally:
+        stop.set()
+        t.join()
@@ -0,0 +1,77 @@
+import asyncio, copy, json, os
+
+import agent.pipeline as pipeline
+import agent.writers.web_exporter as web_exporter
+from agent.artifact import save_schema
+from agent.main import _figma_to_schema
+from agent.schema import UISchema
+
+SAMPLE = os.path.join(os.path.dirname(__file__), "..", "..", "samples", "figma_sample.json")
+
+def _figma_with_image():
+    with open(SAMPLE, "r", encoding="utf-8") as f:
+        figma = json.load(f)
+    frame = figma["document"]["children"][0]["children"][0]
+    frame["children"].append({"id": "9:9", "name": "Photo", "type": "RECTANGLE",
+                              "absoluteBoundingBox": {"x": 10, "y": 10, "width": 50, "height": 50},
+                              "fills": [{"type": "IMAGE", "imageRef": "abc"}]})
+    return figma
+
+class FakeAPI:
+    def __init__(self, figma):
+        self.figma = figma
+
+    def get_file(self, file_id, geometry=False):
+        return copy.deepcopy(self.figma)
+
+    def get_images(self, file_id, ids, scale=2):
+        return {"images": {i: f"https://img.example/{i}.png" for i in ids}}
+
+def _fake_download(url, dest_dir, name_hint):
+    fn = web_exporter._asset_filename(url, name_hint)
+    with open(os.path.join(dest_dir, fn), "wb") as f:
+        f.write(url.encode())
+    return f"./{web_exporter.ASSET_DIR}/{fn}"
+
+def test_pipeline_web_matches_serial(tmp_path, monkeypatch):
+    figma = _figma_with_image()
+    api = FakeAPI(figma)
+    monkeypatch.setattr(pipeline, "_figma_client", lambda file_id: (api, "FILE"))
+    monkeypatch.setattr(pipeline, "_download_image", _fake_download)
+    monkeypatch.setattr(web_exporter, "_download_image", _fake_download)
+
+    serial = tmp_path / "serial"
+    image_map = api.get_images("FILE", ["9:9"])["images"]
+    web_exporter.write_web_export(str(serial), _figma_to_schema(figma, image_map).model_dump())
+
+    piped = tmp_path / "piped"
+    asyncio.run(pipeline.run_pipeline(str(piped), file_id="FILE", sample=False, cull=None, from_schema=None,
+                                      keep_schema=False, mode="web", concurrency=2))
+    for name in ("index.html", "ui-schema.json", "assets/node-9:9.png"):
+        assert (piped / name).read_bytes() == (serial / name).read_bytes()
+    assert "./assets/node-9:9.png" in (piped / "index.html").read_text()
+
+def test_pipeline_image_in_nested_frame(tmp_path, monkeypatch):
+    figma = _figma_with_image()
+    frame = figma["document"]["children"][0]["children"][0]
+    photo = frame["children"].pop()
+    frame["children"].append({"id": "8:0", "name": "Card", "type": "FRAME",
+                              "absoluteBoundingBox": {"x": 0, "y": 0, "width": 80, "height": 80}, "children": [photo]})
+    api = FakeAPI(figma)
+    monkeypatch.setattr(pipeline, "_figma_client", lambda file_id: (api, "FILE"))
+    monkeypatch.setattr(pipeline, "_download_image", _fake_download)
+    monkeypatch.setattr(web_exporter, "_download_image", _fake_download)
+
+    serial = tmp_path / "serial"
+    schema = _figma_to_schema(figma, api.get_images("FILE", ["9:9"])["images"]).model_dump()
+    assert sum(n["id"] == "9:9" for fr in schema["root_frames"] for n in fr["children"]) == 1  # listed under both frames
+    saved = tmp_path / "schema.json.gz"
+    save_schema(UISchema.model_validate(schema), str(saved))  # before the export points images at local copies
+    web_exporter.write_web_export(str(serial), schema)
+
+    for name, from_schema in (("fetched", None), ("loaded", str(saved))):
+        piped = tmp_path / name
+        asyncio.run(pipeline.run_pipeline(str(piped), file_id="FILE", sample=False, cull=None, from_schema=from_schema,
+                                          keep_schema=False, mode="web", concurrency=2))
+        assert (piped / "index.html").read_bytes() == (serial / "index.html").read_bytes()
+        assert (piped / "index.html").read_text().count("./assets/node-9:9.png") == 2
@@ -5,3 +5,24 @@ def test_schema_roundtrip():
     d = ui.model_dump()
     assert d["file_name"] == "x"
     assert d["root_frames"][0]["type"] == "FRAME"
+
+def _artifact_ui():
+    return UISchema(file_name="x", root_frames=[Node(id="1", name="Frame", type="FRAME",
+                  bounds=Bounds(x=0, y=0, width=10, height=5), children=[Node(id="2", name="T", type="TEXT", text="hi")])])
+
+def test_schema_artifact_roundtrip():
+    import json
+    from agent.artifact import decode_schema, encode_schema
+    ui = _artifact_ui()
+    for level in (0, 6):
+        assert decode_schema(encode_schema(ui, level)) == ui
+    # legacy pretty-printed ui-schema.json is still readable
+    assert decode_schema(json.dumps(ui.model_dump(), indent=2).encode()) == ui
+
+def test_schema_artifact_without_orjson(monkeypatch):
+    import agent.artifact as artifact
+    ui = _artifact_ui()
+    fast = artifact.encode_schema(ui, 0)
+    monkeypatch.setattr(artifact, "orjson", None)
+    assert artifact.decode_schema(artifact.encode_schema(ui, 6)) == ui
+    assert artifact.decode_schema(fast) == ui  # artifacts are interchangeable between the two paths
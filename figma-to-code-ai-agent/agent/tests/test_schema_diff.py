@@ -0,0 +1,128 @@
+import copy, os
+
+from agent.codegen import CodeGen
+from agent.main import _llm_update, _write_llm
+from agent.schema import UISchema, Node, Color
+from agent.validation import Issue
+from agent.schema_diff import diff_frames, frame_markers, hash_frame, load_state, save_state
+
+APP = ('import Home from "./components/Home";\nimport About from "./components/About";\n'
+       "export default function App(){ return <><Home/><About/></>; }\n")
+HOME = "// figma-frame: 1:0\nexport default function Home(){ return <h1>hi</h1>; }\n"
+ABOUT = "// figma-frame: 2:0\nexport default function About(){ return <p>about</p>; }\n"
+
+def _schema():
+    return UISchema(file_name="x", root_frames=[
+        Node(id="1:0", name="Home", type="FRAME", children=[
+            Node(id="1:1", name="T", type="TEXT", text="hi"),
+            Node(id="1:2", name="R", type="RECTANGLE", image_url="https://s3/img/a.png?sig=1"),
+        ]),
+        Node(id="2:0", name="About", type="FRAME", children=[Node(id="2:1", name="P", type="TEXT", text="about")]),
+    ]).model_dump()
+
+class FakeGen(CodeGen):
+    def __init__(self, reply):
+        self.reply = reply
+        self.requests = []
+
+    def update(self, changes, current, known_paths, schema):
+        self.requests.append((changes, current, known_paths, schema))
+        return self.reply
+
+def _project(out, schema):
+    for rel, content in (("src/App.tsx", APP), ("src/components/Home.tsx", HOME), ("src/components/About.tsx", ABOUT)):
+        os.makedirs(os.path.dirname(os.path.join(out, rel)), exist_ok=True)
+        with open(os.path.join(out, rel), "w", encoding="utf-8") as f:
+            f.write(content)
+    save_state(out, schema["root_frames"], ["src/App.tsx", "src/components/Home.tsx", "src/components/About.tsx"])
+    return load_state(out)
+
+def test_diff_classifies_frames(tmp_path):
+    schema = _schema()
+    state = _project(str(tmp_path), schema)
+    assert state["frames"]["1:0"]["files"] == ["src/components/Home.tsx"]
+    assert not diff_frames(state, schema["root_frames"]).changed
+
+    new = copy.deepcopy(schema)
+    new["root_frames"][0]["children"][1]["image_url"] = "https://s3/img/a.png?sig=2"  # re-signed only
+    new["root_frames"][0]["children"][0]["fill"] = Color(r=1, g=0, b=0).model_dump()
+    del new["root_frames"][1]
+    new["root_frames"].append(Node(id="3:0", name="New", type="FRAME").model_dump())
+    diff = diff_frames(state, new["root_frames"])
+    assert diff.modified == {"1:0": ["1:1"]}
+    assert (diff.added, diff.removed, diff.unchanged) == (["3:0"], ["2:0"], [])
+
+def test_hash_ignores_where_the_image_is_served_from():
+    remote = _schema()["root_frames"][0]
+    mirrored = copy.deepcopy(remote)
+    mirrored["children"][1]["image_url"] = "/assets/node-1:2.png"  # what --pipeline sends
+    assert hash_frame(mirrored) == hash_frame(remote)
+    mirrored["children"][1]["image_url"] = None
+    assert hash_frame(mirrored)[1]["1:2"] != hash_frame(remote)[1]["1:2"]
+
+def test_frame_markers():
+    assert frame_markers("// figma-frame: 1:0, 4:2\nexport {}\n") == ["1:0", "4:2"]
+    assert frame_markers(APP) == []
+
+def test_incremental_sends_only_changed_frames(tmp_path):
+    out = str(tmp_path)
+    schema = _schema()
+    state = _project(out, schema)
+    assert _llm_update(FakeGen(""), schema, None, 0, out, state) == ([], [])
+
+    new = copy.deepcopy(schema)
+    new["root_frames"][0]["children"][0]["text"] = "hello"
+    edited = HOME.replace("hi", "hello")
+    gen = FakeGen(f"```file:src/components/Home.tsx\n{edited}```\n")
+    files, deleted = _llm_update(gen, new, None, 0, out, state)
+    assert files == [("src/components/Home.tsx", edited.rstrip("\n"))] and deleted == []
+    changes, current, known, partial = gen.requests[0]
+    assert "modified frame 1:0" in changes and "changed nodes 1:1" in changes
+    assert list(current) == ["src/components/Home.tsx"]
+    assert [fr["id"] for fr in partial["root_frames"]] == ["1:0"]
+    assert known == ["src/App.tsx", "src/components/About.tsx", "src/components/Home.tsx"]
+
+def test_removed_frame_deletes_its_file_and_updates_app(tmp_path):
+    out = str(tmp_path)
+    schema = _schema()
+    state = _project(out, schema)
+    new = copy.deepcopy(schema)
+    del new["root_frames"][1]
+    app = 'import Home from "./components/Home";\nexport default function App(){ return <Home/>; }\n'
+    gen = FakeGen(f"```file:src/App.tsx\n{app}```\n")
+    files, deleted = _llm_update(gen, new, None, 0, out, state)
+    about = os.path.join(out, "src/components/About.tsx")
+    assert os.path.exists(about)  # nothing is removed before the new files are written
+    assert [p for p, _ in files] == ["src/App.tsx"] and deleted == ["src/components/About.tsx"]
+    changes, current, known, partial = gen.requests[0]
+    assert "removed frame 2:0" in changes and "src/components/About.tsx" in changes
+    assert list(current) == ["src/App.tsx"] and partial["root_frames"] == []
+    assert "src/components/About.tsx" not in known
+
+    _write_llm(out, files, deleted, new["root_frames"], state["files"])
+    assert not os.path.exists(about)
+    assert load_state(out)["files"] == ["src/App.tsx", "src/components/Home.tsx"]
+
+class RepairGen(FakeGen):
+    def repair(self, failing, known_paths, schema=None):
+        self.repairs.append(failing)
+        return ""
+
+def test_unchanged_failing_base_file_is_not_repaired(tmp_path):
+    out = str(tmp_path)
+    schema = _schema()
+    state = _project(out, schema)
+    new = copy.deepcopy(schema)
+    new["root_frames"][0]["children"][0]["text"] = "hello"
+    flag_about = lambda files: [Issue(p, "flagged") for p in files if p.endswith("About.tsx")]
+    gen = RepairGen(f"```file:src/components/Home.tsx\n{HOME.replace('hi', 'hello')}```\n")
+    gen.repairs = []
+    files, _ = _llm_update(gen, new, [flag_about], 2, out, state)
+    assert [p for p, _ in files] == ["src/components/Home.tsx"]
+    assert gen.repairs == []  # About.tsx already failed before this run and was not touched
+
+    # a file the reply rewrote is still repaired
+    gen = RepairGen(f"```file:src/components/About.tsx\n{ABOUT}// edited\n```\n")
+    gen.repairs = []
+    _llm_update(gen, new, [flag_about], 1, out, state)
+    assert [list(f) for f in gen.repairs] == [["src/components/About.tsx"]]
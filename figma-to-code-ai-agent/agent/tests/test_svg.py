@@ -0,0 +1,70 @@
+from agent.schema import UISchema, Node, Bounds, Color
+from agent.svg import VectorOptimizer, optimize_path, rdp
+from agent.writers.web_exporter import _render_frame
+
+def test_rdp_drops_collinear_points():
+    assert rdp([(0, 0), (1, 0.01), (2, 0), (3, 0)], 0.1) == [(0, 0), (3, 0)]
+    assert rdp([(0, 0), (1, 1), (2, 0)], 0.1) == [(0, 0), (1, 1), (2, 0)]
+
+def test_optimize_path_quantizes_and_simplifies():
+    d = "M 0.0001 0 L 5.004 0 L 10 0 L 10 10 C 10 12.3333 8 14 5.5 14 Z"
+    assert optimize_path(d, precision=2, tolerance=0.25) == "M0 0L10 0L10 10C10 12.33 8 14 5.5 14Z"
+    # unsupported (relative) commands are only quantized
+    assert optimize_path("m 0.123 0 l 1 1 z", precision=1) == "m .1 0 l 1 1 z"
+
+def _icon(id, d):
+    return Node(id=id, name="Icon", type="VECTOR", bounds=Bounds(x=0, y=0, width=10, height=10),
+                fill=Color(r=0, g=0, b=0), fill_geometry=[{"path": d, "rule": "nonzero"}])
+
+def test_repeated_paths_become_symbols():
+    frames = UISchema(file_name="x", root_frames=[
+        Node(id="1", name="F", type="FRAME", children=[_icon("a", "M0 0L10 0L10 10Z"), _icon("b", "M0 0L10 0L10 10Z"),
+                                                        _icon("c", "M0 0L5 5Z")])]).model_dump()["root_frames"]
+    opt = VectorOptimizer()
+    opt.scan(frames)
+    assert opt.symbols == {"v0": "M0 0L10 0L10 10Z"}
+    html = _render_frame(opt.apply(frames[0]), 1)
+    assert html.count('<use href="#v0"') == 2
+    assert '<path d="M0 0L5 5Z"' in html
+    assert "background" not in html  # vectors paint through SVG, not the box
+    assert frames[0]["children"][0]["fill_geometry"][0]["path"] == "M0 0L10 0L10 10Z"  # input untouched
+
+def test_llm_mode_sends_no_path_data(tmp_path, monkeypatch):
+    import json
+    from typer.testing import CliRunner
+    import agent.main as main
+    from agent.artifact import save_schema
+    from agent.config import Settings
+
+    seen = []
+    monkeypatch.setattr(Settings, "validate", classmethod(lambda cls: Settings(gemini_api_key="k")))
+    monkeypatch.setattr(main, "CodeGen", lambda *a: None)
+    monkeypatch.setattr(main, "_llm_files", lambda cg, schema, *a: seen.append(schema) or [])
+    monkeypatch.setattr(main, "_ingest", lambda file_id, sample, cull, vectors: seen.append(vectors) or ui)
+    ui = UISchema(file_name="x", root_frames=[
+        Node(id="1:0", name="F", type="FRAME", children=[_icon("1:1", "M0 0L10 0L10 10Z")])])
+    save_schema(ui, str(tmp_path / "s.json.gz"))
+
+    for args in ([], ["--from-schema", str(tmp_path / "s.json.gz")]):
+        res = CliRunner().invoke(main.app, ["--out", str(tmp_path / "out"), "--full", "--no-save-schema", *args])
+        assert res.exit_code == 0, res.output
+    assert seen[0] is False  # geometry=paths is not requested for the model
+    assert all("M0 0" not in json.dumps(s) for s in seen[1:]) and len(seen) == 3
+
+def test_rotated_vector_is_mapped_into_its_box():
+    from agent.main import _figma_to_schema
+    from agent.svg import vector_svg
+    # a 20x10 arrow rotated 90 degrees: Figma reports a 10x20 bounding box, paths stay in 20x10 space
+    arrow = {"id": "1:1", "name": "Arrow", "type": "VECTOR", "size": {"x": 20, "y": 10},
+             "relativeTransform": [[0, -1, 5], [1, 0, 0]], "absoluteBoundingBox": {"x": 0, "y": 0, "width": 10, "height": 20},
+             "fills": [{"type": "SOLID", "color": {"r": 0, "g": 0, "b": 0}}],
+             "fillGeometry": [{"path": "M0 0L20 5L0 10Z", "windingRule": "NONZERO"}]}
+    upright = {**arrow, "id": "1:2", "relativeTransform": [[1, 0, 0], [0, 1, 0]]}
+    doc = {"document": {"children": [{"type": "CANVAS", "children": [
+        {"id": "1:0", "name": "F", "type": "FRAME", "children": [arrow, upright]}]}]}}
+    rotated, plain = _figma_to_schema(doc, {}).model_dump()["root_frames"][0]["children"]
+    assert rotated["geometry_transform"] == [0, 1, -1, 0, 10, 0]
+    assert plain["geometry_transform"] is None
+    svg = vector_svg(rotated, "#000", None)
+    assert 'viewBox="0 0 10 20"' in svg and '<g transform="matrix(0 1 -1 0 10 0)"><path d="M0 0L20 5L0 10Z"' in svg
+    assert "<g " not in vector_svg(plain, "#000", None)
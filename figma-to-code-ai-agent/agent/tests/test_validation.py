@@ -0,0 +1,50 @@
+from agent.codegen import CodeGen
+from agent.validation import validate, repair_files
+
+APP = 'import React from "react";\nimport Hero from "./components/Hero";\nexport default function App(){ return <Hero/>; }\n'
+HERO = "export default function Hero(){ return <h1>Don't {'panic'}</h1>; }\n"
+
+class FakeGen(CodeGen):
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def repair(self, failing, known_paths, schema=None):
+        self.requests.append((failing, known_paths, schema))
+        return self.replies.pop(0)
+
+def test_validate_flags_unbalanced_and_missing_imports():
+    errs = validate({"src/App.tsx": APP, "src/components/Hero.tsx": "export default function Hero(){ return (<h1/>;"})
+    assert "src/components/Hero.tsx" in errs
+    assert "src/App.tsx" not in errs
+    errs = validate({"src/App.tsx": APP})
+    assert list(errs) == ["src/components/Hero.tsx"]
+    assert validate({"src/App.tsx": APP, "src/components/Hero.tsx": HERO}) == {}
+
+def test_repair_only_requests_failing_files():
+    first = f"```file:src/App.tsx\n{APP}```\n```file:src/components/Hero.tsx\nexport default function Hero(){{ return ("
+    gen = FakeGen([f"```file:src/components/Hero.tsx\n{HERO}```\n"])
+    files = dict(repair_files(gen, first, max_rounds=2, schema={"x": 1}))
+    assert files["src/components/Hero.tsx"] == HERO.rstrip("\n")
+    assert len(gen.requests) == 1
+    failing, known, schema = gen.requests[0]
+    assert list(failing) == ["src/components/Hero.tsx"] and known == ["src/App.tsx"]
+    assert schema is None  # content was present, so no schema resend
+
+def test_balance_accepts_brackets_in_jsx_text_strings_and_regexes():
+    for src in ('export const f = (x) => "(";\n',
+                "export const A = () => <p>Step 1) start</p>;\n",
+                "export const A = () => <p>Price: (USD</p>;\n",
+                "export const r = /\\(/g;\n",
+                'export const A = () => (<ul className="a">{xs.map(x => <li key={x}>{x} :)</li>)}</ul>);\n'):
+        assert validate({"src/A.tsx": src}) == {}, src
+
+def test_balance_flags_truncation_inside_jsx():
+    errs = validate({"src/A.tsx": "export default function A(){ return (<div>\n<p>hi</p>\n"})
+    assert errs["src/A.tsx"] == ["unclosed <div> opened at line 1 (output looks truncated)"]
+
+def test_balance_accepts_generic_function_types():
+    for src in ("export type Fn = <T>(x: T) => T;\n",
+                "type Props = {\n  map: <T>(x: T) => T;\n};\nexport const A = () => <p>Step 1) start</p>;\n",
+                "export const f: <T>(x: T) => T = (x) => x;\n"):
+        assert validate({"src/A.tsx": src}) == {}, src
@@ -0,0 +1,358 @@
+# agent/validation.py
+from __future__ import annotations
+import os, re, shutil, subprocess, tempfile
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from .writers.react_writer import SCaffold_FILES, target_path
+from .utils.logging import log
+
+# bare imports the scaffold's package.json can satisfy
+ALLOWED_PACKAGES = ("react", "react-dom", "react/jsx-runtime", "react-dom/client")
+RESOLVE_SUFFIXES = ("", ".tsx", ".ts", ".jsx", ".js", "/index.tsx", "/index.ts")
+CODE_EXTS = (".tsx", ".ts", ".jsx", ".js")
+
+@dataclass
+class Issue:
+    path: str
+    message: str
+
+# a checker sees the whole project (path -> content) and reports issues per path
+Checker = Callable[[Dict[str, str]], List[Issue]]
+
+_PAIRS = {")": "(", "]": "[", "}": "{"}
+# tokens after which `<` starts JSX and `/` starts a regex (an expression is expected)
+_EXPR_START = set("=(,:[{?&|!;+-*%~^<>") | {"", "=>", "return", "case", "default", "yield", "await",
+                                           "typeof", "in", "of", "else", "do", "void", "delete", "new"}
+_WORD = re.compile(r"[\w$]+")
+_TAG_NAME = re.compile(r"[A-Za-z][\w.:-]*")
+# `type Name<...> =` at the start of a statement: its right-hand side is a type, never JSX
+_TYPE_ALIAS = re.compile(r"type\s+[A-Za-z_$][\w$]*\s*(?:<[^>]*>\s*)?=(?!=)")
+_ALIAS_LEAD = re.compile(r"(?:^|[;{}])\s*(?:(?:export|declare)\s+)*$")
+# `: <T>(x: T) => T` in an annotation: a generic function type, not an element
+_TYPE_PARAMS = re.compile(r"<[A-Za-z_$][\w$]*(?:\s*,\s*[A-Za-z_$][\w$]*)*>\s*\(")
+
+class _Unbalanced(Exception):
+    pass
+
+class _Scanner:
+    """Bracket/string/JSX structure check for one TSX file.
+
+    Code, JSX tags and JSX children are scanned in their own modes, so
+    brackets and quotes in JSX text ("Step 1) start", "Don't") are text.
+    """
+
+    def __init__(self, src: str):
+        self.src, self.i, self.line = src, 0, 1
+
+    def _skip_comment(self) -> bool:
+        src, i = self.src, self.i
+        if src.startswith("//", i):
+            j = src.find("\n", i)
+            self.i = len(src) if j < 0 else j
+            return True
+        if src.startswith("/*", i):
+            j = src.find("*/", i + 2)
+            if j < 0:
+                raise _Unbalanced(f"unterminated block comment starting at line {self.line}")
+            self.line += src.count("\n", i, j)
+            self.i = j + 2
+            return True
+        return False
+
+    def _string(self, quote: str, multiline: bool = False) -> None:
+        start, src, n = self.line, self.src, len(self.src)
+        self.i += 1
+        while self.i < n and src[self.i] != quote:
+            ch = src[self.i]
+            if ch == "\\":
+                self.i += 1
+            elif ch == "\n":
+                if quote != "`" and not multiline:
+                    raise _Unbalanced(f"unterminated string starting at line {start}")
+                self.line += 1
+            elif quote == "`" and src.startswith("${", self.i):
+                self.i += 2
+                self.code("}", self.line)
+                continue
+            self.i += 1
+        if self.i >= n:
+            raise _Unbalanced(f"unterminated string starting at line {start}")
+        self.i += 1
+
+    def _regex(self) -> bool:
+        src, j, in_class = self.src, self.i + 1, False
+        while j < len(src) and src[j] != "\n":
+            if src[j] == "\\":
+                j += 1
+            elif src[j] == "[":
+                in_class = True
+            elif src[j] == "]":
+                in_class = False
+            elif src[j] == "/" and not in_class:
+                m = _WORD.match(src, j + 1)
+                self.i = m.end() if m else j + 1
+                return True
+            j += 1
+        return False  # not a regex after all; treat the slash as division
+
+    def _jsx_start(self) -> bool:
+        src, i = self.src, self.i + 1
+        if src.startswith(">", i):
+            return True
+        m = _TAG_NAME.match(src, i)
+        if not m:
+            return False
+        rest = src[m.end():m.end() + 12].lstrip()
+        return not (rest.startswith(",") or rest.startswith("extends "))  # <T,>() => / <T extends X>
+
+    def element(self) -> None:
+        start, src, n = self.line, self.src, len(self.src)
+        self.i += 1
+        m = _TAG_NAME.match(src, self.i)
+        name = m.group(0) if m else ""
+        self.i = m.end() if m else self.i
+        while True:
+            if self.i >= n:
+                raise _Unbalanced(f"unclosed tag <{name}> opened at line {start} (output looks truncated)")
+            ch = src[self.i]
+            if ch == "\n":
+                self.line += 1
+            elif src.startswith("/>", self.i):
+                self.i += 2
+                return
+            elif ch == ">":
+                self.i += 1
+                break
+            elif ch in "'\"":
+                self._string(ch, multiline=True)
+                continue
+            elif ch == "{":
+                self.i += 1
+                self.code("}", self.line)
+                continue
+            self.i += 1
+        # children: text until a child element, an expression or the closing tag
+        while self.i < n:
+            ch = src[self.i]
+            if ch == "\n":
+                self.line += 1
+            elif ch == "{":
+                self.i += 1
+                self.code("}", self.line)
+                continue
+            elif src.startswith("</", self.i):
+                j = src.find(">", self.i)
+                if j < 0:
+                    break
+                self.i = j + 1
+                return
+            elif ch == "<" and self._jsx_start():
+                self.element()
+                continue
+            self.i += 1
+        raise _Unbalanced(f"unclosed <{name}> opened at line {start} (output looks truncated)")
+
+    def code(self, end: Optional[str] = None, end_line: int = 0) -> None:
+        """Scan code up to the `end` bracket that closes an enclosing `{` (EOF if None)."""
+        src, n = self.src, len(self.src)
+        stack: List[Tuple[str, int]] = []
+        prev = ""
+        alias: Optional[int] = None  # bracket depth of the type alias being scanned
+        while self.i < n:
+            ch = src[self.i]
+            if alias is not None and len(stack) == alias and (
+                    ch == ";" or (ch == "\n" and prev not in _EXPR_START and prev != "=>")):
+                alias = None
+            if ch == "\n":
+                self.line += 1
+            elif ch.isspace():
+                pass
+            elif self._skip_comment():
+                continue
+            elif ch in "'\"`":
+                self._string(ch)
+                prev = "a"
+                continue
+            elif ch == "/" and prev in _EXPR_START and self._regex():
+                prev = "a"
+                continue
+            elif ch == "<" and prev in _EXPR_START and alias is None \
+                    and not (prev == ":" and _TYPE_PARAMS.match(src, self.i)) and self._jsx_start():
+                self.element()
+                prev = "a"
+                continue
+            elif ch == "=" and src.startswith("=>", self.i):
+                prev = "=>"
+                self.i += 2
+                continue
+            elif _WORD.match(ch):
+                word = _WORD.match(src, self.i).group(0)
+                if word == "type" and _TYPE_ALIAS.match(src, self.i) and \
+                        _ALIAS_LEAD.search(src, max(0, self.i - 40), self.i):
+                    alias = len(stack)
+                prev = word if word in _EXPR_START else "a"
+                self.i += len(word)
+                continue
+            else:
+                if ch in "([{":
+                    stack.append((ch, self.line))
+                elif ch in ")]}":
+                    if not stack and ch == end:
+                        self.i += 1
+                        return
+                    if not stack or stack[-1][0] != _PAIRS[ch]:
+                        raise _Unbalanced(f"unexpected '{ch}' at line {self.line}")
+                    stack.pop()
+                prev = ch
+            self.i += 1
+        if stack:
+            ch, ln = stack[-1]
+            raise _Unbalanced(f"unclosed '{ch}' opened at line {ln} (output looks truncated)")
+        if end:
+            raise _Unbalanced(f"unclosed '{_PAIRS[end]}' opened at line {end_line} (output looks truncated)")
+
+def _balance_error(src: str) -> Optional[str]:
+    try:
+        _Scanner(src).code()
+    except _Unbalanced as e:
+        return str(e)
+    return None
+
+def check_balance(files: Dict[str, str]) -> List[Issue]:
+    issues: List[Issue] = []
+    for path, content in files.items():
+        if not path.endswith(CODE_EXTS):
+            continue
+        if not content.strip():
+            issues.append(Issue(path, "file is empty"))
+            continue
+        err = _balance_error(content)
+        if err:
+            issues.append(Issue(path, err))
+    return issues
+
+_IMPORT_RE = re.compile(r"""(?:^|\n)\s*(?:import|export)\s[^;'"]*?from\s*['"]([^'"]+)['"]|(?:^|\n)\s*import\s*['"]([^'"]+)['"]""")
+
+def _resolves(spec: str, importer: str, known: Dict[str, str]) -> bool:
+    base = os.path.normpath(os.path.join(os.path.dirname(importer), spec)).replace(os.sep, "/")
+    return any(base + suf in known for suf in RESOLVE_SUFFIXES)
+
+def check_imports(files: Dict[str, str]) -> List[Issue]:
+    known = dict.fromkeys(SCaffold_FILES, "")
+    known.update(files)
+    issues: List[Issue] = []
+    for path, content in files.items():
+        if not path.endswith(CODE_EXTS):
+            continue
+        for m in _IMPORT_RE.finditer(content):
+            spec = m.group(1) or m.group(2)
+            if spec.startswith("."):
+                if not _resolves(spec, path, known):
+                    missing = os.path.normpath(os.path.join(os.path.dirname(path), spec)).replace(os.sep, "/")
+                    if not os.path.splitext(missing)[1]:
+                        missing += ".tsx"
+                    # report against the missing module so the repair round generates it
+                    issues.append(Issue(missing, f"imported by {path} as '{spec}' but the file does not exist"))
+            elif spec not in ALLOWED_PACKAGES:
+                issues.append(Issue(path, f"imports '{spec}', which is not a project dependency"))
+    return issues
+
+_TSC_LINE = re.compile(r"^(?P<file>[^(\n]+)\((?P<line>\d+),(?P<col>\d+)\): error (?P<code>TS\d+): (?P<msg>.*)$", re.M)
+
+def check_tsc(files: Dict[str, str]) -> List[Issue]:
+    """Syntax-check with a local `tsc` if one is installed (no-op otherwise).
+
+    Only TS1xxx (syntax) diagnostics are reported: without node_modules the
+    type checker cannot resolve React, so semantic errors would be noise.
+    """
+    tsc = shutil.which("tsc")
+    code_files = [p for p in files if p.endswith((".ts", ".tsx"))]
+    if not tsc or not code_files:
+        return []
+    with tempfile.TemporaryDirectory() as tmp:
+        for path in code_files:
+            full = os.path.join(tmp, path)
+            os.makedirs(os.path.dirname(full), exist_ok=True)
+            with open(full, "w", encoding="utf-8") as f:
+                f.write(files[path])
+        cmd = [tsc, "--noEmit", "--pretty", "false", "--jsx", "react-jsx", "--noResolve",
+               "--skipLibCheck", "--target", "ES2020", *code_files]
+        try:
+            res = subprocess.run(cmd, cwd=tmp, capture_output=True, text=True, timeout=120)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            log(f"[yellow]tsc check skipped: {e}[/yellow]")
+            return []
+    issues: List[Issue] = []
+    for m in _TSC_LINE.finditer(res.stdout):
+        if m.group("code").startswith("TS1"):
+            issues.append(Issue(m.group("file").strip().replace(os.sep, "/"),
+                                f"line {m.group('line')}:{m.group('col')} {m.group('code')}: {m.group('msg')}"))
+    return issues
+
+DEFAULT_CHECKERS: List[Checker] = [check_balance, check_imports]
+
+def validate(files: Dict[str, str], checkers: Optional[List[Checker]] = None) -> Dict[str, List[str]]:
+    """Run checkers and group error messages by path."""
+    out: Dict[str, List[str]] = {}
+    for chk in (checkers if checkers is not None else DEFAULT_CHECKERS):
+        for issue in chk(files):
+            out.setdefault(issue.path, []).append(issue.message)
+    return out
+
+def _merge_reply(cg, text: str, files: Dict[str, str], truncated: set) -> None:
+    """Merge fenced files from `text` into `files`, tracking which blocks were cut off."""
+    for name, content in cg.parse_fenced_files(text):
+        files[target_path(name)] = content
+        truncated.discard(target_path(name))
+    for name, content in cg.unterminated_files(text):
+        files[target_path(name)] = content
+        truncated.add(target_path(name))
+
+def _errors(files: Dict[str, str], truncated: set, checkers: Optional[List[Checker]],
+            known: Optional[set] = None, touched: Optional[set] = None) -> Dict[str, List[str]]:
+    errors = validate(files, checkers)
+    if known:
+        # issues the existing project already had are not the reply's to fix,
+        # unless the reply rewrote that file
+        errors = {p: kept for p, errs in errors.items()
+                  if (kept := [e for e in errs if p in touched or (p, e) not in known])}
+    for path in truncated:
+        errors.setdefault(path, []).insert(0, "fenced block was not terminated (output truncated)")
+    return errors
+
+def repair_files(cg, llm_text: str, checkers: Optional[List[Checker]] = None, max_rounds: int = 2,
+                 schema: Optional[dict] = None, base: Optional[Dict[str, str]] = None,
+                 removed: Iterable[str] = ()) -> List[Tuple[str, str]]:
+    """Parse LLM output, then re-request only the files that fail validation.
+
+    Each round sends the failing files with their errors; results are merged
+    back by path. Stops when everything validates or after `max_rounds`.
+    `base` holds files already in the project (path -> content): the reply is
+    merged over them so imports resolve, but only issues the reply introduced
+    are sent for repair. `removed` base paths are dropped before merging, so
+    imports of them count as new issues.
+    """
+    known = {(p, e) for p, errs in validate(base, checkers).items() for e in errs} if base else set()
+    files: Dict[str, str] = {p: c for p, c in (base or {}).items() if p not in set(removed)}
+    truncated: set = set()
+    touched: set = set()
+
+    def merge(text: str) -> None:
+        before = dict(files)
+        _merge_reply(cg, text, files, truncated)
+        touched.update(p for p, c in files.items() if before.get(p) != c)
+
+    merge(llm_text)
+    errors = _errors(files, truncated, checkers, known, touched)
+    for rnd in range(1, max_rounds + 1):
+        if not errors:
+            break
+        log(f"[yellow]Repair round {rnd}: {len(errors)} failing file(s): {', '.join(sorted(errors))}[/yellow]")
+        failing = {p: (files.get(p), errs) for p, errs in errors.items()}
+        missing = any(content is None for content, _ in failing.values())
+        merge(cg.repair(failing, sorted(p for p in files if p not in errors), schema if missing else None))
+        errors = _errors(files, truncated, checkers, known, touched)
+    if errors:
+        log(f"[yellow]Still failing after {max_rounds} repair round(s): {', '.join(sorted(errors))}[/yellow]")
+    return list(files.items())
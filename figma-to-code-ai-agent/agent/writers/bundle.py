@@ -0,0 +1,156 @@
+# agent/writers/bundle.py
+"""Production bundle for the web export.
+
+Reads what `write_web_export` wrote and produces `<out>/dist/`:
+index.html with the CSS inlined and minified, small assets inlined as
+data URIs, no script tag when script.js is empty, and the remaining
+assets copied under content-hashed names (listed in manifest.json) so
+they can be cached forever. Text files get precompressed .gz (and .br
+when brotli is installed) siblings for servers that serve them directly.
+"""
+from __future__ import annotations
+import base64, gzip, hashlib, json, os, re, shutil
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from .web_exporter import ASSET_DIR
+
+try:  # optional: .br siblings are skipped without it
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+DIST_DIR = "dist"
+MANIFEST = "manifest.json"
+INLINE_LIMIT = 4096
+TEXT_EXTS = (".html", ".css", ".js", ".json", ".svg")
+MIME = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".webp": "image/webp", ".svg": "image/svg+xml"}
+
+@dataclass
+class BundleStats:
+    before_bytes: int
+    before_requests: int
+    after_bytes: int
+    after_requests: int
+
+def minify_css(css: str) -> str:
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{}:;,>])\s*", r"\1", css)
+    return css.replace(";}", "}").strip()
+
+_WHOLE_PX = re.compile(r"(?<=\d)\.0(?=px\b)")  # 40.0px -> 40px
+
+def _minify_style_attr(m: re.Match) -> str:
+    # _style_inline joins "k: v" pairs with "; "; leave anything else untouched
+    decls = []
+    for decl in m.group(1).split("; "):
+        k, sep, v = decl.partition(": ")
+        if not (sep and re.fullmatch(r"[\w-]+", k)):
+            decls.append(decl)
+        elif v != "None":  # e.g. an unset opacity: invalid, so browsers drop it anyway
+            decls.append(f"{k}:{_WHOLE_PX.sub('', v)}")
+    return f'style="{";".join(decls)}"'
+
+def minify_html(html: str) -> str:
+    # nodes are absolutely positioned, so whitespace between tags never renders
+    html = re.sub(r">\s+<", "><", html)
+    html = re.sub(r'style="([^"]*)"', _minify_style_attr, html)
+    return html.strip()
+
+def _hashed_name(rel: str, data: bytes) -> str:
+    stem, ext = os.path.splitext(rel)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+def _wire_size(data: bytes, path: str) -> int:
+    """Bytes on the wire: the smallest encoding a client could be sent."""
+    if not path.endswith(TEXT_EXTS):
+        return len(data)
+    sizes = [len(data), len(gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        sizes.append(len(brotli.compress(data, quality=11)))
+    return min(sizes)
+
+def _precompress(path: str) -> None:
+    with open(path, "rb") as f:
+        data = f.read()
+    encoded = [(".gz", gzip.compress(data, compresslevel=9, mtime=0))]
+    if brotli is not None:
+        encoded.append((".br", brotli.compress(data, quality=11)))
+    for ext, blob in encoded:
+        if len(blob) < len(data):
+            with open(path + ext, "wb") as f:
+                f.write(blob)
+
+def _script_is_empty(js: str) -> bool:
+    return not re.sub(r"//[^\n]*|/\*.*?\*/", "", js, flags=re.S).strip()
+
+def _read(path: str) -> Optional[bytes]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        return f.read()
+
+def bundle_web_export(out_dir: str, inline_limit: int = INLINE_LIMIT, dist_dir: Optional[str] = None) -> BundleStats:
+    """Build the optimized bundle from an existing web export in `out_dir`."""
+    dist = dist_dir or os.path.join(out_dir, DIST_DIR)
+    html_bytes = _read(os.path.join(out_dir, "index.html"))
+    if html_bytes is None:
+        raise RuntimeError(f"No web export in {out_dir} (index.html missing)")
+    html = html_bytes.decode("utf-8")
+    css = (_read(os.path.join(out_dir, "styles.css")) or b"").decode("utf-8")
+    js = (_read(os.path.join(out_dir, "script.js")) or b"").decode("utf-8")
+
+    if os.path.exists(dist):
+        shutil.rmtree(dist)
+    os.makedirs(dist)
+
+    # what the plain export costs: page, stylesheet, script and every local asset it references
+    before = [("index.html", html_bytes), ("styles.css", css.encode("utf-8")), ("script.js", js.encode("utf-8"))]
+    assets: Dict[str, Tuple[str, bytes]] = {}  # url as written -> (relative path, bytes)
+    for url in dict.fromkeys(re.findall(rf"""url\(['"]?(\./{ASSET_DIR}/[^'")]+)['"]?\)""", html)):
+        rel = url[2:]
+        data = _read(os.path.join(out_dir, rel))
+        if data is not None:
+            assets[url] = (rel, data)
+            before.append((rel, data))
+
+    manifest: Dict[str, str] = {}
+    after = []
+    for url, (rel, data) in assets.items():
+        ext = os.path.splitext(rel)[1].lower()
+        if len(data) <= inline_limit and ext in MIME:
+            target = f"data:{MIME[ext]};base64,{base64.b64encode(data).decode('ascii')}"
+        else:
+            hashed = _hashed_name(rel, data)
+            os.makedirs(os.path.dirname(os.path.join(dist, hashed)), exist_ok=True)
+            with open(os.path.join(dist, hashed), "wb") as f:
+                f.write(data)
+            manifest[rel] = hashed
+            after.append((hashed, data))
+            target = f"./{hashed}"
+        html = html.replace(url, target)
+
+    html = re.sub(r'\s*<link rel="stylesheet" href="\./styles\.css"/>', f"<style>{minify_css(css)}</style>", html)
+    if _script_is_empty(js):
+        html = re.sub(r'\s*<script src="\./script\.js"></script>', "", html)
+    else:
+        hashed = _hashed_name("script.js", js.encode("utf-8"))
+        with open(os.path.join(dist, hashed), "w", encoding="utf-8") as f:
+            f.write(js)
+        manifest["script.js"] = hashed
+        after.append((hashed, js.encode("utf-8")))
+        html = html.replace('src="./script.js"', f'src="./{hashed}"')
+    page = minify_html(html).encode("utf-8")
+    after.insert(0, ("index.html", page))
+
+    with open(os.path.join(dist, "index.html"), "wb") as f:
+        f.write(page)
+    with open(os.path.join(dist, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    for rel, _ in after:
+        if rel.endswith(TEXT_EXTS):
+            _precompress(os.path.join(dist, rel))
+
+    return BundleStats(before_bytes=sum(len(d) for _, d in before), before_requests=len(before),
+                       after_bytes=sum(_wire_size(d, rel) for rel, d in after), after_requests=len(after))
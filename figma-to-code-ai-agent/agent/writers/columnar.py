@@ -0,0 +1,206 @@
+# agent/writers/columnar.py
+"""Array-backed view of a schema tree for batch style computation.
+
+The web writer's dict path formats one node at a time (`_style`). Here the tree is flattened once into
+NumPy columns (bounds, opacity, fill/stroke RGBA, stroke width, radii, parent
+index). Colour conversion, masking and number formatting then run a column at
+a time, and each distinct number is formatted only once, because designs
+reuse the same colours, radii and sizes everywhere. Rarer, string-heavy
+properties (gradients, images, text styles, shadows) reuse the dict helpers
+for just the nodes that have them, so the output is identical to the dict
+path. Only the web writer uses it: for the React writer it measured no
+faster than the dict path.
+"""
+from __future__ import annotations
+import gc
+from contextlib import contextmanager
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import Any, Dict, List
+
+try:  # optional: only needed for --columnar
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+def available() -> bool:
+    return np is not None
+
+def _floats(values: list) -> "np.ndarray":
+    # None becomes NaN
+    return np.array(values, dtype=float)
+
+@contextmanager
+def _gc_paused():
+    # the build allocates one tuple per node and never forms cycles; letting the
+    # collector rescan the whole (large, live) schema meanwhile costs more than the build
+    was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if was_enabled:
+            gc.enable()
+
+def _rows(items: list, keys: tuple, missing: tuple = ()) -> List[tuple]:
+    """`keys` of each dict as a tuple (`missing` where the item is None).
+
+    Fetching all of a node's fields in one pass touches each dict once,
+    which matters more than anything else on trees that do not fit in cache.
+    """
+    missing = missing or (None,) * len(keys)
+    get = itemgetter(*keys)
+    try:
+        return [get(d) if d is not None else missing for d in items]
+    except KeyError:  # hand-built dicts may omit fields
+        return [tuple(d.get(k) for k in keys) if d is not None else missing for d in items]
+
+def _matrix(items: list, keys: tuple) -> "np.ndarray":
+    rows = _rows(items, keys, (0.0,) * len(keys))
+    try:  # fromiter skips np.array's nested-sequence inspection
+        flat = np.fromiter(chain.from_iterable(rows), dtype=float, count=len(rows) * len(keys))
+    except TypeError:  # a None inside a dict
+        flat = _floats(rows)
+    return flat.reshape(len(items), len(keys))
+
+# every node field the table reads
+_FIELDS = ("bounds", "opacity", "fill", "stroke", "stroke_width", "corner_radius_all", "corner_radius_tl",
+           "corner_radius_tr", "corner_radius_br", "corner_radius_bl", "type", "fill_geometry", "stroke_geometry",
+           "gradient", "image_url", "text_style", "effects")
+
+def _fmt(col, nan: str = "nan") -> "np.ndarray":
+    """str() of every element (object array), formatting each distinct value once.
+
+    Uniqueness is taken on the raw bits so -0.0 and 0.0 keep their own text.
+    """
+    col = np.ascontiguousarray(col)
+    u, inv = np.unique(col.view(np.int64), return_inverse=True)
+    vals = u.view(col.dtype).tolist()
+    text = np.array([nan if v != v else str(v) for v in vals] or [""], dtype=object)
+    return text[inv.reshape(-1)]
+
+def _join(*parts) -> "np.ndarray":
+    """Element-wise concatenation of object arrays and plain strings."""
+    cols = [repeat(p) if isinstance(p, str) else p.tolist() for p in parts]
+    rows = list(map("".join, zip(*cols)))
+    out = np.empty(len(rows), dtype=object)
+    out[:] = rows
+    return out
+
+def _opt(mask, *parts) -> "np.ndarray":
+    """`"".join(parts)` where mask is set, "" elsewhere."""
+    return np.where(mask, _join(*parts), "")
+
+def _sparse(n: int, values: Dict[int, str]) -> "np.ndarray":
+    out = np.full(n, "", dtype=object)
+    if values:
+        out[list(values)] = list(values.values())
+    return out
+
+class NodeTable:
+    """Flattened (pre-order) columns for every node under the given frames' children."""
+
+    def __init__(self, nodes: List[Dict[str, Any]], parent: List[int]):
+        if np is None:
+            raise RuntimeError("numpy is required for the columnar renderer (pip install numpy)")
+        self.nodes = nodes
+        self.parent = np.asarray(parent, dtype=np.int64)
+        with _gc_paused():
+            cols = self._cols = dict(zip(_FIELDS, zip(*_rows(nodes, _FIELDS)))) if nodes else {k: () for k in _FIELDS}
+            self.has_bounds = np.array([b is not None for b in cols["bounds"]], dtype=bool)
+            self.x, self.y, self.w, self.h = _matrix(cols["bounds"], ("x", "y", "width", "height")).T
+            self.has_fill = np.array([bool(c) for c in cols["fill"]], dtype=bool)
+            self.fill = _matrix(cols["fill"], ("r", "g", "b", "a"))
+            self.has_stroke = np.array([bool(c) for c in cols["stroke"]], dtype=bool)
+            self.stroke = _matrix(cols["stroke"], ("r", "g", "b", "a"))
+        self.opacity = _floats(cols["opacity"])
+        self.stroke_width = _floats(cols["stroke_width"])
+        self.radius = {k: _floats(cols[f"corner_radius_{k}"]) for k in ("all", "tl", "tr", "br", "bl")}
+        self.is_ellipse = np.array([t == "ELLIPSE" for t in cols["type"]], dtype=bool)
+        self.is_vector = np.array([bool(f or s) for f, s in zip(cols["fill_geometry"], cols["stroke_geometry"])], dtype=bool)
+
+    def _present(self, field: str) -> List[int]:
+        """Indices of nodes with a truthy `field`."""
+        return [i for i, v in enumerate(self._cols[field]) if v]
+
+    @classmethod
+    def from_frames(cls, frames: List[Dict[str, Any]]) -> "NodeTable":
+        nodes: List[Dict[str, Any]] = []
+        parent: List[int] = []
+        # parallel stacks rather than (node, parent) tuples: no per-node allocation
+        stack = [c for fr in reversed(frames) for c in reversed(fr.get("children") or [])]
+        parents = [-1] * len(stack)
+        while stack:
+            nd = stack.pop()
+            parent.append(parents.pop())
+            kids = nd.get("children")
+            if kids:
+                stack.extend(reversed(kids))
+                parents.extend([len(nodes)] * len(kids))
+            nodes.append(nd)
+        return cls(nodes, parent)
+
+    @staticmethod
+    def _rgb(c: "np.ndarray", alpha: "np.ndarray") -> "np.ndarray":
+        ints = (np.nan_to_num(c[:, :3]) * 255).astype(np.int64)
+        return _join("rgba(", _fmt(ints[:, 0]), ",", _fmt(ints[:, 1]), ",", _fmt(ints[:, 2]), ",", alpha, ")")
+
+    def _geometry(self) -> List["np.ndarray"]:
+        num = lambda col: np.where(self.has_bounds, _fmt(col), "0")
+        return ["position: absolute; left: ", num(self.x), "px; top: ", num(self.y), "px; width: ", num(self.w),
+                "px; height: ", num(self.h), "px; opacity: ", _fmt(self.opacity, "None")]
+
+    def _stroked(self, plain: "np.ndarray") -> "np.ndarray":
+        sw = self.stroke_width
+        return plain & self.has_stroke & ~np.isnan(sw) & (sw != 0)
+
+    def web_styles(self) -> List[str]:
+        """Inline CSS per node, identical to `_style_inline(_style(n))`."""
+        from .web_exporter import _box_shadow, _gradient_css, _text_and_shadow
+
+        n = len(self.nodes)
+        if not n:
+            return []
+        plain = ~self.is_vector
+
+        # gradients, images, text styles and shadows are rare: format them per node
+        grad: Dict[int, str] = {}
+        img: Dict[int, str] = {}
+        tail: Dict[int, str] = {}
+        for i in self._present("gradient"):
+            if plain[i]:
+                g = _gradient_css(self.nodes[i]["gradient"])
+                if g:
+                    grad[i] = f"; background: {g}"
+        for i in self._present("image_url"):
+            if plain[i] and i not in grad:
+                img[i] = (f"; background-image: url('{self.nodes[i]['image_url']}'); background-size: cover; "
+                          f"background-position: center center; background-repeat: no-repeat")
+        for i in sorted(set(self._present("text_style")) | set(self._present("effects"))):
+            nd = self.nodes[i]
+            if nd.get("text_style") or _box_shadow(nd.get("effects") or []):
+                css: Dict[str, str] = {}
+                _text_and_shadow(nd, css)
+                tail[i] = "".join(f"; {k}: {v}" for k, v in css.items())
+
+        has_grad = np.zeros(n, dtype=bool)
+        has_grad[list(grad)] = True
+        # _rgba writes a missing or zero alpha as 1.0
+        alpha = lambda c: _fmt(np.where((c[:, 3] == 0) | np.isnan(c[:, 3]), 1.0, c[:, 3]))
+        fill = _opt(plain & ~has_grad & self.has_fill, "; background: ", self._rgb(self.fill, alpha(self.fill)))
+        border = _opt(self._stroked(plain), "; border: ", _fmt(np.nan_to_num(self.stroke_width).astype(np.int64)),
+                      "px solid ", self._rgb(self.stroke, alpha(self.stroke)))
+
+        r = self.radius
+        has_all = ~np.isnan(r["all"])
+        corners = [np.where(plain & self.is_ellipse, "; border-radius: 9999px",
+                            _opt(plain & has_all, "; border-radius: ", _fmt(r["all"]), "px"))]
+        per_corner = plain & ~self.is_ellipse & ~has_all
+        for k, name in (("tl", "top-left"), ("tr", "top-right"), ("br", "bottom-right"), ("bl", "bottom-left")):
+            corners.append(_opt(per_corner & ~np.isnan(r[k]), f"; border-{name}-radius: ", _fmt(r[k]), "px"))
+
+        return _join(*self._geometry(), _sparse(n, grad), fill, _sparse(n, img), border, *corners,
+                     _sparse(n, tail)).tolist()
+
+    def web_style_map(self) -> Dict[int, str]:
+        return dict(zip(map(id, self.nodes), self.web_styles()))
@@ -0,0 +1,67 @@
+# agent/writers/parallel.py
+from __future__ import annotations
+import multiprocessing, os, threading
+from multiprocessing.context import BaseContext
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..schema import compact_node, inflate_node
+
+# (frame_dict, 1-based index) -> rendered text; must be a module-level function so it pickles
+FrameRenderer = Callable[[Dict[str, Any], int], str]
+
+# frames handed to forked workers without pickling (set only while a pool is alive)
+_SHARED: List[Dict[str, Any]] = []
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """0/None means one worker per available core."""
+    if not workers:
+        try:
+            return max(1, len(os.sched_getaffinity(0)))
+        except AttributeError:
+            return os.cpu_count() or 1
+    return max(1, workers)
+
+def pool_context() -> BaseContext:
+    """Start method for a new pool: fork only while this process is single-threaded.
+
+    Forking with other threads alive (e.g. --pipeline downloads) can copy a
+    lock some thread holds and deadlock the child.
+    """
+    if multiprocessing.get_start_method() == "fork" and threading.active_count() > 1:
+        methods = multiprocessing.get_all_start_methods()
+        return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+    return multiprocessing.get_context()
+
+def _render_shared(job: Tuple[FrameRenderer, int]) -> str:
+    fn, idx = job
+    return fn(_SHARED[idx - 1], idx)
+
+def _render_payload(job: Tuple[FrameRenderer, Dict[str, Any], int]) -> str:
+    fn, payload, idx = job
+    return fn(inflate_node(payload), idx)
+
+def render_frames(fn: FrameRenderer, frames: List[Dict[str, Any]], workers: Optional[int] = 1) -> List[str]:
+    """Render frames with `fn`, optionally across a process pool.
+
+    With the fork start method (see `pool_context`) workers read the frames
+    they inherited and only an index crosses the process boundary; otherwise
+    each frame is sent as a compacted dict. Results come back in input order, so the output is
+    identical to the serial path.
+    """
+    global _SHARED
+    n = min(resolve_workers(workers), len(frames))
+    if n <= 1:
+        return [fn(fr, i) for i, fr in enumerate(frames, start=1)]
+    chunksize = max(1, len(frames) // (n * 4))
+    ctx = pool_context()
+    if ctx.get_start_method() == "fork":
+        _SHARED = frames
+        try:
+            with ProcessPoolExecutor(max_workers=n, mp_context=ctx) as pool:
+                return list(pool.map(_render_shared, [(fn, i) for i in range(1, len(frames) + 1)], chunksize=chunksize))
+        finally:
+            _SHARED = []
+    jobs = [(fn, compact_node(fr), i) for i, fr in enumerate(frames, start=1)]
+    with ProcessPoolExecutor(max_workers=n, mp_context=ctx) as pool:
+        return list(pool.map(_render_payload, jobs, chunksize=chunksize))
@@ -1,11 +1,20 @@
 from __future__ import annotations
 import os
 from typing import Dict, Any, List, Optional
+from .parallel import render_frames
+from ..svg import VectorOptimizer, sprite_svg, vector_svg
 
 def _css_rgba(c: Optional[Dict[str, Any]]) -> Optional[str]:
     if not c: return None
     return f"rgba({int(c['r']*255)},{int(c['g']*255)},{int(c['b']*255)},{c.get('a',1)})"
 
+def _is_vector(n: Dict[str, Any]) -> bool:
+    return bool(n.get("fill_geometry") or n.get("stroke_geometry"))
+
+def _vector_fill(n: Dict[str, Any]) -> Optional[str]:
+    stops = (n.get("gradient") or {}).get("stops") or []
+    return _css_rgba(stops[0]["color"]) if stops else _css_rgba(n.get("fill"))
+
 def _style_from_node(n: Dict[str, Any]) -> str:
     b = n.get("bounds") or {}
     styles = {
@@ -16,18 +25,20 @@ def _style_from_node(n: Dict[str, Any]) -> str:
         "height": f"{b.get('height',0)}px",
         "opacity": n.get("opacity",1)
     }
-    if n.get("fill"):
-        styles["backgroundColor"] = _css_rgba(n["fill"])
-    if n.get("stroke") and n.get("stroke_width"):
-        styles["border"] = f"{n['stroke_width']}px solid {_css_rgba(n['stroke'])}"
-    # corner radii
-    if n.get("corner_radius_all"):
-        styles["borderRadius"] = f"{n['corner_radius_all']}px"
-    else:
-        if n.get("corner_radius_tl") is not None: styles["borderTopLeftRadius"] = f"{n['corner_radius_tl']}px"
-        if n.get("corner_radius_tr") is not None: styles["borderTopRightRadius"] = f"{n['corner_radius_tr']}px"
-        if n.get("corner_radius_br") is not None: styles["borderBottomRightRadius"] = f"{n['corner_radius_br']}px"
-        if n.get("corner_radius_bl") is not None: styles["borderBottomLeftRadius"] = f"{n['corner_radius_bl']}px"
+    # vectors paint fill, stroke and shape through their inline SVG
+    if not _is_vector(n):
+        if n.get("fill"):
+            styles["backgroundColor"] = _css_rgba(n["fill"])
+        if n.get("stroke") and n.get("stroke_width"):
+            styles["border"] = f"{n['stroke_width']}px solid {_css_rgba(n['stroke'])}"
+        # corner radii
+        if n.get("corner_radius_all"):
+            styles["borderRadius"] = f"{n['corner_radius_all']}px"
+        else:
+            if n.get("corner_radius_tl") is not None: styles["borderTopLeftRadius"] = f"{n['corner_radius_tl']}px"
+            if n.get("corner_radius_tr") is not None: styles["borderTopRightRadius"] = f"{n['corner_radius_tr']}px"
+            if n.get("corner_radius_br") is not None: styles["borderBottomRightRadius"] = f"{n['corner_radius_br']}px"
+            if n.get("corner_radius_bl") is not None: styles["borderBottomLeftRadius"] = f"{n['corner_radius_bl']}px"
     # text styles
     ts = n.get("text_style") or {}
     if ts.get("font_family"): styles["fontFamily"] = ts["font_family"]
@@ -48,7 +59,16 @@ def _render_node(n: Dict[str, Any], indent=4) -> str:
         children_tsx = ""  # text has no children
         return f"{pad}<div style={{ {{ {style} }} }}>{txt}</div>"
 
-    # treat vectors/ellipses/rectangles/groups as div boxes; recurse children
+    if _is_vector(n):
+        svg = vector_svg(n, _vector_fill(n), _css_rgba(n.get("stroke")), jsx=True)
+        if t == "BOOLEAN_OPERATION" or not n.get("children"):
+            return f"{pad}<div style={{ {{ {style} }} }}>{svg}</div>"
+        children_tsx = "\n".join(_render_node(c, indent+2) for c in n["children"])
+        return f"""{pad}<div style={{ {{ {style} }} }}>{svg}
+{children_tsx}
+{pad}</div>"""
+
+    # treat rectangles/groups (and vectors without geometry) as div boxes; recurse children
     children_tsx = "\n".join(_render_node(c, indent+2) for c in (n.get("children") or []))
     return f"""{pad}<div style={{ {{ {style} }} }}>
 {children_tsx}
@@ -70,15 +90,17 @@ export default function Frame{idx}(){{
 }}
 """
 
-def write_schema_render(out_dir: str, schema: Dict[str, Any]) -> None:
+def write_schema_render(out_dir: str, schema: Dict[str, Any], workers: Optional[int] = 1) -> None:
     src = os.path.join(out_dir, "src")
     comps = os.path.join(src, "components")
     os.makedirs(comps, exist_ok=True)
 
     frames: List[Dict[str, Any]] = schema.get("root_frames") or []
     imports, uses = [], []
-    for i, fr in enumerate(frames, start=1):
-        code = _render_frame_component(fr, i)
+    vectors = VectorOptimizer()
+    vectors.scan(frames)
+    rendered = render_frames(_render_frame_component, [vectors.apply(fr) for fr in frames], workers)
+    for i, code in enumerate(rendered, start=1):
         fn = os.path.join(comps, f"Frame{i}.tsx")
         with open(fn, "w", encoding="utf-8") as f: f.write(code)
         imports.append(f'import Frame{i} from "./components/Frame{i}";')
@@ -88,6 +110,9 @@ def write_schema_render(out_dir: str, schema: Dict[str, Any]) -> None:
         # fallback
         imports = []
         uses = ["      <div className=\"p-10\">No frames detected.</div>"]
+    sprite = sprite_svg(vectors.symbols, jsx=True)
+    if sprite:
+        uses.insert(0, f"      {sprite}")
 
     app_tsx = f"""import React from "react";
 {os.linesep.join(imports)}
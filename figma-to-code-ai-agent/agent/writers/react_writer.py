@@ -1,6 +1,6 @@
 from __future__ import annotations
 import os, shutil
-from typing import List, Tuple
+from typing import Iterable, List, Tuple
 from ..utils.logging import log
 
 SCaffold_FILES = {
@@ -109,21 +109,28 @@ ReactDOM.createRoot(document.getElementById("root")!).render(
 :root { color-scheme: light; }'''
 }
 
-def init_scaffold(out_dir: str):
+def init_scaffold(out_dir: str, keep: Iterable[str] = ()):
+    """Write the Vite scaffold; paths in `keep` (generated on a previous run) are left alone."""
     os.makedirs(os.path.join(out_dir, "src"), exist_ok=True)
+    keep = set(keep)
     for rel, content in SCaffold_FILES.items():
+        if rel in keep and os.path.exists(os.path.join(out_dir, rel)):
+            continue
         full = os.path.join(out_dir, rel)
         os.makedirs(os.path.dirname(full), exist_ok=True)
         with open(full, "w", encoding="utf-8") as f:
             f.write(content)
     log(f"[green]Scaffold created in {out_dir}[/green]")
 
+def target_path(name: str) -> str:
+    """Project-relative path an LLM file name is written to."""
+    if name.startswith("src/") or name.startswith("public/") or name.startswith("index.html"):
+        return name
+    return "src/" + name
+
 def write_llm_files(out_dir: str, files: List[Tuple[str,str]]):
     for name, content in files:
-        if name.startswith("src/") or name.startswith("public/") or name.startswith("index.html"):
-            path = os.path.join(out_dir, name)
-        else:
-            path = os.path.join(out_dir, "src", name)
+        path = os.path.join(out_dir, target_path(name))
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, "w", encoding="utf-8") as f:
             f.write(content)
@@ -3,6 +3,9 @@ from __future__ import annotations
 import os, json, re
 from typing import Dict, Any, Optional, List
 import requests
+from .parallel import render_frames, resolve_workers
+from .columnar import NodeTable
+from ..svg import VectorOptimizer, sprite_svg, vector_svg
 
 ASSET_DIR = "assets"
 
@@ -40,15 +43,18 @@ def _ensure_assets_dir(out_dir: str) -> str:
     os.makedirs(d, exist_ok=True)
     return d
 
+def _asset_filename(url: str, name_hint: str) -> str:
+    # pick extension if present
+    ext = ".png"
+    m = re.search(r"\.(png|jpg|jpeg|webp)(?:\?|$)", url, re.I)
+    if m: ext = "." + m.group(1).lower()
+    return f"{name_hint}{ext}"
+
 def _download_image(url: str, dest_dir: str, name_hint: str) -> Optional[str]:
     try:
         r = requests.get(url, timeout=30)
         r.raise_for_status()
-        # pick extension if present
-        ext = ".png"
-        m = re.search(r"\.(png|jpg|jpeg|webp)(?:\?|$)", url, re.I)
-        if m: ext = "." + m.group(1).lower()
-        fn = f"{name_hint}{ext}"
+        fn = _asset_filename(url, name_hint)
         path = os.path.join(dest_dir, fn)
         with open(path, "wb") as f: f.write(r.content)
         return f"./{ASSET_DIR}/{fn}"
@@ -65,6 +71,11 @@ def _style(n: Dict[str, Any]) -> Dict[str, str]:
         "height": f"{b.get('height',0)}px",
         "opacity": str(n.get("opacity", 1)),
     }
+    # vectors paint their own fill/stroke through inline SVG
+    if _is_vector(n):
+        _text_and_shadow(n, css)
+        return css
+
     # fill / gradient / image
     grad = _gradient_css(n.get("gradient"))
     if grad:
@@ -94,6 +105,10 @@ def _style(n: Dict[str, Any]) -> Dict[str, str]:
         if n.get("corner_radius_br") is not None: css["border-bottom-right-radius"] = f"{n['corner_radius_br']}px"
         if n.get("corner_radius_bl") is not None: css["border-bottom-left-radius"] = f"{n['corner_radius_bl']}px"
 
+    _text_and_shadow(n, css)
+    return css
+
+def _text_and_shadow(n: Dict[str, Any], css: Dict[str, str]) -> None:
     # text styles
     ts = n.get("text_style") or {}
     if ts.get("font_family"): css["font-family"] = ts["font_family"]
@@ -106,7 +121,13 @@ def _style(n: Dict[str, Any]) -> Dict[str, str]:
     bs = _box_shadow(n.get("effects") or [])
     if bs: css["box-shadow"] = bs
 
-    return css
+def _is_vector(n: Dict[str, Any]) -> bool:
+    return bool(n.get("fill_geometry") or n.get("stroke_geometry"))
+
+def _vector_fill(n: Dict[str, Any]) -> Optional[str]:
+    # SVG paths take one paint; approximate gradients by their first stop
+    stops = (n.get("gradient") or {}).get("stops") or []
+    return _rgba(stops[0]["color"]) if stops else _rgba(n.get("fill"))
 
 def _style_inline(style_dict: Dict[str, str]) -> str:
     return "; ".join(f"{k}: {v}" for k,v in style_dict.items())
@@ -114,55 +135,66 @@ def _style_inline(style_dict: Dict[str, str]) -> str:
 def _escape_text(t: str) -> str:
     return (t or "").replace("&","&amp;").replace("<","&lt;").replace(">","&gt;")
 
-def _render_node(n: Dict[str, Any], indent: int = 6) -> str:
+def _render_node(n: Dict[str, Any], indent: int = 6, styles: Optional[Dict[int, str]] = None) -> str:
     pad = " " * indent
-    style = _style(n)
+    style = styles[id(n)] if styles is not None else _style_inline(_style(n))
     if n.get("type") == "TEXT":
-        return f'{pad}<div class="node text" style="{_style_inline(style)}">{_escape_text(n.get("text") or "")}</div>'
-    children_html = "\n".join(_render_node(c, indent+2) for c in (n.get("children") or []))
-    return f"""{pad}<div class="node {n.get('type','').lower()}" style="{_style_inline(style)}">
+        return f'{pad}<div class="node text" style="{style}">{_escape_text(n.get("text") or "")}</div>'
+    if _is_vector(n):
+        svg = vector_svg(n, _vector_fill(n), _rgba(n.get("stroke")))
+        # a boolean operation's geometry is already the combined result of its children
+        if n.get("type") == "BOOLEAN_OPERATION" or not n.get("children"):
+            return f'{pad}<div class="node vector" style="{style}">{svg}</div>'
+        children_html = "\n".join(_render_node(c, indent+2, styles) for c in n["children"])
+        return f"""{pad}<div class="node vector" style="{style}">{svg}
+{children_html}
+{pad}</div>"""
+    children_html = "\n".join(_render_node(c, indent+2, styles) for c in (n.get("children") or []))
+    return f"""{pad}<div class="node {n.get('type','').lower()}" style="{style}">
 {children_html}
 {pad}</div>"""
 
-def _render_frame(frame: Dict[str, Any], idx: int) -> str:
+def _render_frame(frame: Dict[str, Any], idx: int, styles: Optional[Dict[int, str]] = None) -> str:
     b = frame.get("bounds") or {}
     w = int(b.get("width", 1200))
     h = int(b.get("height", 800))
-    children = "\n".join(_render_node(c, 8) for c in (frame.get("children") or []))
+    children = "\n".join(_render_node(c, 8, styles) for c in (frame.get("children") or []))
     return f"""    <section class="frame" id="frame-{idx}" style="width:{w}px; height:{h}px;">
 {children}
     </section>"""
 
+def _render_frame_columnar(frame: Dict[str, Any], idx: int) -> str:
+    return _render_frame(frame, idx, NodeTable.from_frames([frame]).web_style_map())
+
+def _render_all(frames: List[Dict[str, Any]], workers: Optional[int], columnar: bool) -> List[str]:
+    if not columnar:
+        return render_frames(_render_frame, frames, workers)
+    if resolve_workers(workers) > 1:
+        return render_frames(_render_frame_columnar, frames, workers)
+    # serial: one batch across the whole document
+    styles = NodeTable.from_frames(frames).web_style_map()
+    return [_render_frame(fr, i, styles) for i, fr in enumerate(frames, start=1)]
+
 def _gather_all_nodes(n: Dict[str, Any], out: List[Dict[str, Any]]):
     out.append(n)
     for c in (n.get("children") or []):
         _gather_all_nodes(c, out)
 
-def write_web_export(out_dir: str, schema: Dict[str, Any]) -> None:
-    os.makedirs(out_dir, exist_ok=True)
-    assets_dir = _ensure_assets_dir(out_dir)
-
-    # optionally mirror image URLs locally (if available)
-    # we rewrite node.image_url to local path after download succeeds
-    frames: List[Dict[str, Any]] = schema.get("root_frames") or []
-    for fr in frames:
-        nodes: List[Dict[str, Any]] = []
-        _gather_all_nodes(fr, nodes)
-        for n in nodes:
-            u = n.get("image_url")
-            if u and u.startswith("http"):
-                local = _download_image(u, assets_dir, f"node-{n.get('id','img')}")
-                if local:
-                    n["image_url"] = local  # rewrite CSS to local asset
+def _remote_image_nodes(frame: Dict[str, Any]) -> List[Dict[str, Any]]:
+    nodes: List[Dict[str, Any]] = []
+    _gather_all_nodes(frame, nodes)
+    return [n for n in nodes if (n.get("image_url") or "").startswith("http")]
 
+def _write_page(out_dir: str, schema: Dict[str, Any], rendered_frames: List[str], sprite: str = "") -> None:
     src_html = os.path.join(out_dir, "index.html")
     css = os.path.join(out_dir, "styles.css")
     js = os.path.join(out_dir, "script.js")
     json_path = os.path.join(out_dir, "ui-schema.json")
 
-    frames_html = "\n".join(_render_frame(fr, i+1) for i, fr in enumerate(frames)) or \
+    frames_html = "\n".join(rendered_frames) or \
         '    <section class="frame" style="width:1200px;height:800px;"><div class="node text" style="position:absolute;left:40px;top:40px">No frames detected.</div></section>'
 
+    sprite_html = f"  {sprite}\n" if sprite else ""
     html = f"""<!doctype html>
 <html lang="en">
 <head>
@@ -172,7 +204,7 @@ def write_web_export(out_dir: str, schema: Dict[str, Any]) -> None:
   <link rel="stylesheet" href="./styles.css"/>
 </head>
 <body>
-  <main>
+{sprite_html}  <main>
 {frames_html}
   </main>
   <script src="./script.js"></script>
@@ -196,3 +228,21 @@ main{padding:32px}
 
     with open(json_path, "w", encoding="utf-8") as f:
         json.dump(schema, f, indent=2)
+
+def write_web_export(out_dir: str, schema: Dict[str, Any], workers: Optional[int] = 1, columnar: bool = False) -> None:
+    os.makedirs(out_dir, exist_ok=True)
+    assets_dir = _ensure_assets_dir(out_dir)
+
+    # optionally mirror image URLs locally (if available)
+    # we rewrite node.image_url to local path after download succeeds
+    frames: List[Dict[str, Any]] = schema.get("root_frames") or []
+    for fr in frames:
+        for n in _remote_image_nodes(fr):
+            local = _download_image(n["image_url"], assets_dir, f"node-{n.get('id','img')}")
+            if local:
+                n["image_url"] = local  # rewrite CSS to local asset
+
+    vectors = VectorOptimizer()
+    vectors.scan(frames)
+    rendered = _render_all([vectors.apply(fr) for fr in frames], workers, columnar)
+    _write_page(out_dir, schema, rendered, sprite_svg(vectors.symbols))
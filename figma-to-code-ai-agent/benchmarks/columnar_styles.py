@@ -0,0 +1,42 @@
+# benchmarks/columnar_styles.py
+"""Per-node dict styles vs. batched NumPy (columnar) styles for the web export.
+
+    python -m benchmarks.columnar_styles [--sizes 10000,100000,1000000] [--repeat 3]
+
+The columnar time includes building the NodeTable from the schema dicts,
+since that is what `--columnar` pays on every render.
+"""
+from __future__ import annotations
+import argparse, time
+
+from agent.writers.columnar import NodeTable
+from agent.writers.web_exporter import _style, _style_inline
+from .synthetic import make_schema_frames
+
+def _best(fn, repeat: int):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", default="10000,100000,1000000")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    for size in (int(s) for s in args.sizes.split(",")):
+        frames = make_schema_frames(size)
+        nodes = NodeTable.from_frames(frames).nodes
+        t_build, _ = _best(lambda: NodeTable.from_frames(frames), args.repeat)
+        t_dict, expected = _best(lambda: [_style_inline(_style(n)) for n in nodes], args.repeat)
+        t_col, got = _best(lambda: NodeTable.from_frames(frames).web_styles(), args.repeat)
+        assert got == expected, "columnar output differs from the dict path"
+        print(f"{len(nodes):>8} nodes: dict {t_dict*1000:8.1f} ms  columnar {t_col*1000:8.1f} ms "
+              f"(table build {t_build*1000:.1f} ms)  x{t_dict/t_col:4.2f}")
+        del frames, nodes
+
+if __name__ == "__main__":
+    main()
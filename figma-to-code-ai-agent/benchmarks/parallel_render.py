@@ -0,0 +1,42 @@
+# benchmarks/parallel_render.py
+"""Scaling of per-frame rendering across worker processes.
+
+    python -m benchmarks.parallel_render [--frames 400]
+"""
+from __future__ import annotations
+import argparse, hashlib, os, tempfile, time
+
+from agent.main import _figma_to_schema
+from agent.writers.react_renderer import write_schema_render
+from agent.writers.web_exporter import write_web_export
+from .synthetic import make_figma_file
+
+def _digest(root: str) -> str:
+    h = hashlib.sha256()
+    for dp, _, fns in sorted(os.walk(root)):
+        for fn in sorted(fns):
+            with open(os.path.join(dp, fn), "rb") as f:
+                h.update(fn.encode() + f.read())
+    return h.hexdigest()[:12]
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=400)
+    ap.add_argument("--workers", default="1,2,4,8")
+    args = ap.parse_args()
+
+    schema = _figma_to_schema(make_figma_file(args.frames), {}).model_dump()
+    print(f"{args.frames} frames, cores available: {os.cpu_count()}")
+    for name, writer in (("react", write_schema_render), ("web", write_web_export)):
+        base = None
+        for w in (int(x) for x in args.workers.split(",")):
+            with tempfile.TemporaryDirectory() as tmp:
+                t0 = time.perf_counter()
+                writer(tmp, schema, workers=w)
+                dt = time.perf_counter() - t0
+                digest = _digest(tmp)
+            base = base or dt
+            print(f"{name:5s} workers={w}: {dt*1000:8.1f} ms  speedup x{base/dt:4.2f}  output {digest}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/schema_artifact.py
+"""Save/load cost of the schema artifact vs. the pretty-printed ui-schema.json.
+
+    python -m benchmarks.schema_artifact [--frames 400]
+"""
+from __future__ import annotations
+import argparse, json, os, tempfile, time
+
+from agent.artifact import decode_schema, encode_schema
+from agent.main import _figma_to_schema
+from agent.schema import UISchema
+from .synthetic import make_figma_file
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=400)
+    args = ap.parse_args()
+
+    ui = _figma_to_schema(make_figma_file(args.frames), {})
+    with tempfile.TemporaryDirectory() as tmp:
+        pretty = os.path.join(tmp, "ui-schema.json")
+
+        def save_pretty():
+            with open(pretty, "w", encoding="utf-8") as f:
+                json.dump(ui.model_dump(), f, indent=2)
+
+        def load_pretty():
+            with open(pretty, "r", encoding="utf-8") as f:
+                UISchema.model_validate(json.load(f))
+
+        rows = [("json indent=2", _time(save_pretty), _time(load_pretty), lambda: os.path.getsize(pretty))]
+        for level in (0, 1, 6):
+            path = os.path.join(tmp, f"artifact-{level}")
+
+            def save(level=level, path=path):
+                with open(path, "wb") as f:
+                    f.write(encode_schema(ui, level))
+
+            def load(path=path):
+                with open(path, "rb") as f:
+                    decode_schema(f.read())
+
+            rows.append((f"artifact gzip={level}", _time(save), _time(load), lambda path=path: os.path.getsize(path)))
+
+        print(f"{args.frames} frames")
+        for name, save_s, load_s, size in rows:
+            print(f"{name:18s} save {save_s*1000:8.1f} ms  load {load_s*1000:8.1f} ms  size {size()/1e6:8.2f} MB")
+
+if __name__ == "__main__":
+    main()
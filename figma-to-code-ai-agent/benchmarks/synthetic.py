@@ -0,0 +1,78 @@
+# benchmarks/synthetic.py
+"""Deterministic synthetic Figma files for benchmarks."""
+from __future__ import annotations
+import random
+from typing import Any, Dict, List
+
+def _paint(rng: random.Random) -> Dict[str, Any]:
+    if rng.random() < 0.2:
+        return {"type": "GRADIENT_LINEAR", "gradientTransform": [[0, 1, 0], [-1, 0, 1]],
+                "gradientStops": [{"position": 0, "color": {"r": rng.random(), "g": rng.random(), "b": rng.random(), "a": 1}},
+                                  {"position": 1, "color": {"r": rng.random(), "g": rng.random(), "b": rng.random(), "a": 1}}]}
+    return {"type": "SOLID", "color": {"r": rng.random(), "g": rng.random(), "b": rng.random()}, "opacity": 1}
+
+def _node(rng: random.Random, fid: int, path: str, depth: int, fanout: int, x: float, y: float) -> Dict[str, Any]:
+    w, h = rng.randint(20, 400), rng.randint(20, 200)
+    box = {"x": x + rng.randint(0, 200), "y": y + rng.randint(0, 200), "width": w, "height": h}
+    if depth == 0 and rng.random() < 0.4:
+        return {"id": f"{fid}:{path}", "name": "Label", "type": "TEXT", "absoluteBoundingBox": box,
+                "characters": f"Text {path}", "fills": [_paint(rng)],
+                "style": {"fontFamily": "Inter", "fontSize": 16, "fontWeight": 400, "lineHeightPx": 24,
+                          "textAlignHorizontal": "LEFT"}}
+    n: Dict[str, Any] = {
+        "id": f"{fid}:{path}", "name": f"Node {path}", "type": rng.choice(["RECTANGLE", "FRAME", "ELLIPSE", "GROUP"]),
+        "absoluteBoundingBox": box, "fills": [_paint(rng)], "cornerRadius": rng.choice([0, 4, 8]),
+        "effects": [{"type": "DROP_SHADOW", "visible": True, "offset": {"x": 0, "y": 2}, "radius": 4,
+                     "color": {"r": 0, "g": 0, "b": 0, "a": 0.2}}] if rng.random() < 0.3 else [],
+    }
+    if rng.random() < 0.15:
+        n["visible"] = False
+    if depth > 0:
+        n["children"] = [_node(rng, fid, f"{path}.{i}", depth - 1, fanout, box["x"], box["y"]) for i in range(fanout)]
+    return n
+
+def make_figma_file(frames: int = 300, depth: int = 2, fanout: int = 6, seed: int = 0) -> Dict[str, Any]:
+    """A Figma-file-shaped dict with `frames` top-level frames of ~fanout**depth nodes each."""
+    rng = random.Random(seed)
+    top: List[Dict[str, Any]] = []
+    for f in range(frames):
+        top.append({
+            "id": f"{f}:0", "name": f"Frame {f}", "type": "FRAME", "clipsContent": True,
+            "absoluteBoundingBox": {"x": 0, "y": f * 1000, "width": 1200, "height": 800},
+            "fills": [{"type": "SOLID", "color": {"r": 1, "g": 1, "b": 1}, "opacity": 1}],
+            "children": [_node(rng, f, str(i), depth, fanout, 0, f * 1000) for i in range(fanout)],
+        })
+    return {"name": "Synthetic", "document": {"id": "0:0", "name": "Document", "type": "DOCUMENT", "children": [
+        {"id": "0:1", "name": "Page 1", "type": "CANVAS", "children": top}]}}
+
+def make_schema_frames(nodes: int, per_frame: int = 500, seed: int = 0) -> List[Dict[str, Any]]:
+    """Dumped-UISchema-shaped frames with about `nodes` nodes, built without pydantic (fast at 1M)."""
+    from agent.schema import inflate_node
+    rng = random.Random(seed)
+    # design-like values: whole-pixel positions, a small palette, a handful of sizes
+    palette = [{"r": rng.random(), "g": rng.random(), "b": rng.random(), "a": 1.0} for _ in range(24)]
+    frames: List[Dict[str, Any]] = []
+    made = 0
+    while made < nodes:
+        children = []
+        for i in range(min(per_frame, nodes - made)):
+            n: Dict[str, Any] = {
+                "id": f"{len(frames)}:{i}", "name": "N", "type": rng.choice(["RECTANGLE", "ELLIPSE", "TEXT", "FRAME"]),
+                "bounds": {"x": float(rng.randrange(1200)), "y": float(rng.randrange(800)),
+                           "width": float(rng.randrange(8, 400, 4)), "height": float(rng.randrange(8, 200, 4))},
+                "fill": dict(rng.choice(palette)),
+                "opacity": rng.choice([None, 1.0, 0.5]),
+            }
+            if rng.random() < 0.3:
+                n["stroke"], n["stroke_width"] = {"r": 0.0, "g": 0.0, "b": 0.0, "a": 1.0}, 1.0
+            if rng.random() < 0.5:
+                n["corner_radius_all"] = float(rng.choice([4, 8, 12]))
+            if n["type"] == "TEXT":
+                n["text"] = "Label"
+                n["text_style"] = {"font_family": "Inter", "font_size": 16.0, "font_weight": 400, "line_height": 24.0,
+                                   "letter_spacing": None, "text_align": "LEFT"}
+            children.append(inflate_node(n))
+        made += len(children)
+        frames.append(inflate_node({"id": f"{len(frames)}:0", "name": "F", "type": "FRAME", "children": children,
+                                    "bounds": {"x": 0.0, "y": 0.0, "width": 1200.0, "height": 800.0}}))
+    return frames
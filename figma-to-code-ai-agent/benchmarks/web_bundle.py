@@ -0,0 +1,45 @@
+# benchmarks/web_bundle.py
+"""Transfer size and request count of the plain web export vs. --bundle.
+
+    python -m benchmarks.web_bundle [--frames 40] [--images 30] [--inline-limit 4096]
+
+Images are random bytes (incompressible, like real PNG/JPEG data) with a
+mix of sizes around the inline limit.
+"""
+from __future__ import annotations
+import argparse, os, random, tempfile
+
+from agent.main import _figma_to_schema
+from agent.writers.bundle import bundle_web_export
+from agent.writers.web_exporter import ASSET_DIR, write_web_export
+from .synthetic import make_figma_file
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=40)
+    ap.add_argument("--images", type=int, default=30)
+    ap.add_argument("--inline-limit", type=int, default=4096)
+    args = ap.parse_args()
+
+    rng = random.Random(0)
+    schema = _figma_to_schema(make_figma_file(args.frames), {}).model_dump()
+    with tempfile.TemporaryDirectory() as out:
+        os.makedirs(os.path.join(out, ASSET_DIR))
+        frames = [fr for fr in schema["root_frames"] if fr["children"]]
+        for i in range(args.images):
+            name = f"img-{i}.png"
+            with open(os.path.join(out, ASSET_DIR, name), "wb") as f:
+                f.write(rng.randbytes(rng.choice([600, 1500, 3000, 12000, 60000])))
+            node = frames[i % len(frames)]["children"][0]
+            node["image_url"] = f"./{ASSET_DIR}/{name}"
+        write_web_export(out, schema)
+        st = bundle_web_export(out, args.inline_limit)
+
+    print(f"frames={args.frames} images={args.images} inline_limit={args.inline_limit}")
+    print(f"before: {st.before_requests:4d} requests  {st.before_bytes:>10,} bytes (uncompressed)")
+    print(f"after:  {st.after_requests:4d} requests  {st.after_bytes:>10,} bytes (best precompressed encoding)")
+    print(f"        {st.before_requests - st.after_requests} fewer requests, "
+          f"{100 * (1 - st.after_bytes / st.before_bytes):.1f}% fewer bytes")
+
+if __name__ == "__main__":
+    main()